@@ -1,6 +1,7 @@
 import os
-import bcrypt
-from pymongo import MongoClient
+from com.niteshsynergy.db.day22ClientPool import get_client, get_collection, DEFAULT_DB
+from com.niteshsynergy.db.day22Indexes import ensure_indexes
+from com.niteshsynergy.db.day22Hashing import hash_password, check_password
 
 # ==========================================
 # 🔹 OS Module: Interacting with File System
@@ -28,9 +29,11 @@ if os.path.exists("renamed_folder"):
 # 🔹 MongoDB Connection (You Can Test This)
 # ==========================================
 print("\n📌 Connecting to MongoDB...")
-client = MongoClient("mongodb://localhost:27017/")
-db = client["test_db"]
-collection = db["users"]
+# One URI for everything below: MONGO_URI, default mongodb://localhost:27017/
+client = get_client()  # Shared, pooled client (see day22ClientPool.py)
+db = client[DEFAULT_DB]
+collection = get_collection("users")
+ensure_indexes(db)  # Unique username + lookup indexes (see day22Indexes.py)
 print("✅ MongoDB Connected!")
 
 # ==========================================
@@ -111,15 +114,15 @@ with client.start_session() as session:
 # 🔹 User Management System (Register & Login)
 # ==========================================
 def register_user(username, password):
-    hashed_password = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-    users = db["users"]
+    hashed_password = hash_password(password)  # bcrypt runs on the hashing pool (see day22Hashing.py)
+    users = get_collection("users")
     users.insert_one({"username": username, "password": hashed_password})
     print(f"✅ User '{username}' Registered")
 
 def login_user(username, password):
-    users = db["users"]
+    users = get_collection("users")
     user = users.find_one({"username": username})
-    if user and bcrypt.checkpw(password.encode(), user["password"]):
+    if user and check_password(password, user["password"]):
         print(f"✅ Login Successful for '{username}'")
     else:
         print(f"❌ Login Failed for '{username}'")
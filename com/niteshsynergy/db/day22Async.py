@@ -0,0 +1,182 @@
+"""
+MongoDB Async CRUD & Auth - Motor (asyncio) Version of day22
+"""
+
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from com.niteshsynergy.db.day22ClientPool import DEFAULT_URI, DEFAULT_DB, POOL_OPTIONS, get_collection
+
+# ==========================================
+# 🔹 Why Async?
+# ==========================================
+"""
+- In day22, `login_user()` blocks a whole thread for the network round trip.
+- With Motor, every operation is awaited: while one login waits on MongoDB, the
+  event loop serves the others → thousands of logins share ONE thread.
+- `asyncio.Semaphore(limit)` caps how many operations are in flight, so the
+  connection pool (maxPoolSize) is not flooded.
+- bcrypt is CPU work, not I/O → it runs in a thread via `asyncio.to_thread()` so
+  it never blocks the event loop.
+- A `mongomock://` URI uses `mongomock_motor` (if installed) as an in-memory stand-in.
+  Its store is separate from the sync mongomock client, so the sync vs async
+  benchmark is skipped there: the sync half would query an empty collection.
+"""
+
+# ==========================================
+# 🔹 Async Client (one per URI)
+# ==========================================
+_clients = {}
+
+
+def get_async_client(uri=None):
+    uri = uri or DEFAULT_URI
+    client = _clients.get(uri)
+    if client is None:
+        if uri.startswith("mongomock://"):
+            from mongomock_motor import AsyncMongoMockClient
+            client = AsyncMongoMockClient()
+        else:
+            client = AsyncIOMotorClient(uri, **POOL_OPTIONS)
+        _clients[uri] = client
+    return client
+
+
+def get_async_collection(name="users", db_name=DEFAULT_DB, uri=None):
+    return get_async_client(uri)[db_name][name]
+
+# ==========================================
+# 🔹 Async CRUD Operations
+# ==========================================
+async def insert_user(document, collection=None):
+    collection = collection or get_async_collection()
+    result = await collection.insert_one(document)
+    return result.inserted_id
+
+
+async def insert_users(documents, collection=None):
+    collection = collection or get_async_collection()
+    result = await collection.insert_many(documents, ordered=False)
+    return result.inserted_ids
+
+
+async def find_user(query, collection=None):
+    collection = collection or get_async_collection()
+    return await collection.find_one(query)
+
+
+async def find_users(query=None, collection=None, batch_size=1000):
+    collection = collection or get_async_collection()
+    async for document in collection.find(query or {}, batch_size=batch_size):
+        yield document
+
+
+async def update_user(query, update, collection=None):
+    collection = collection or get_async_collection()
+    result = await collection.update_one(query, update)
+    return result.modified_count
+
+
+async def delete_user(query, collection=None):
+    collection = collection or get_async_collection()
+    result = await collection.delete_one(query)
+    return result.deleted_count
+
+
+async def adjust_balance_in_transaction(name, opening_balance, delta, uri=None):
+    """Async version of the David transaction: insert + $inc, committed together."""
+    client = get_async_client(uri)
+    collection = client[DEFAULT_DB]["users"]
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            await collection.insert_one({"name": name, "balance": opening_balance}, session=session)
+            await collection.update_one({"name": name}, {"$inc": {"balance": delta}}, session=session)
+
+# ==========================================
+# 🔹 Async User Management (Register & Login)
+# ==========================================
+async def register_user(username, password, collection=None):
+    collection = collection or get_async_collection()
+    hashed_password = await asyncio.to_thread(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
+    await collection.insert_one({"username": username, "password": hashed_password})
+    return True
+
+
+async def login_user(username, password, collection=None):
+    collection = collection or get_async_collection()
+    user = await collection.find_one({"username": username})
+    if not user:
+        return False
+    return await asyncio.to_thread(bcrypt.checkpw, password.encode(), user["password"])
+
+
+async def login_many(credentials, limit=200, collection=None):
+    """Run many logins on one event loop with at most `limit` in flight."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def guarded(username, password):
+        async with semaphore:
+            return await login_user(username, password, collection)
+
+    return await asyncio.gather(*(guarded(u, p) for u, p in credentials))
+
+# ==========================================
+# 🔹 Benchmark: Sync + Threads vs Async
+# ==========================================
+def benchmark_sync_threads(usernames, threads=64):
+    collection = get_collection("users")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda u: collection.find_one({"username": u}), usernames))
+    return len(usernames) / (time.perf_counter() - start)
+
+
+async def benchmark_async(usernames, limit=200):
+    collection = get_async_collection()
+    semaphore = asyncio.Semaphore(limit)
+
+    async def lookup(username):
+        async with semaphore:
+            return await collection.find_one({"username": username})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(u) for u in usernames))
+    return len(usernames) / (time.perf_counter() - start)
+
+
+async def main():
+    collection = get_async_collection()
+    await collection.delete_many({})
+
+    print("\n📌 Async CRUD:")
+    await insert_user({"name": "Alice", "age": 25, "city": "New York"})
+    print("✅ Found:", await find_user({"name": "Alice"}))
+    print("✅ Updated:", await update_user({"name": "Alice"}, {"$set": {"age": 26}}))
+    print("✅ Deleted:", await delete_user({"name": "Alice"}))
+
+    print("\n📌 Async Register & Login:")
+    await register_user("john_doe", "secure123")
+    results = await login_many([("john_doe", "secure123"), ("john_doe", "wrongpassword")])
+    print(f"✅ Login results: {results}")  # [True, False]
+
+    print("\n📌 Lookup Throughput (ops/sec):")
+    if DEFAULT_URI.startswith("mongomock://"):
+        print("⚠️ Skipped: sync and async mongomock clients do not share data")
+        await collection.drop()
+        return
+    usernames = [f"user_{i}" for i in range(int(os.environ.get("BENCH_OPS", 20000)))]
+    await insert_users([{"username": u} for u in usernames])
+    print(f"✅ async (1 thread): {await benchmark_async(usernames):.0f}")
+    sync_rate = await asyncio.to_thread(benchmark_sync_threads, usernames)
+    print(f"✅ sync (64 threads): {sync_rate:.0f}")
+
+    await collection.drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+"""
+db Benchmark Suite - CRUD Throughput, Latency Percentiles & Client CPU
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+from com.niteshsynergy.db.day22ClientPool import get_client, DEFAULT_DB, DEFAULT_URI
+from com.niteshsynergy.db.day22Hashing import register_user, login_user
+
+# ==========================================
+# 🔹 What Is Measured
+# ==========================================
+"""
+- Workloads, each driven by `threads` client threads:
+  - insert  → insert-heavy (`insert_one`)
+  - read    → read-heavy (`find_one` by name)
+  - mixed   → 50% `update_one` ($set / $inc), 50% `delete_one` + re-insert
+  - txn     → insert + $inc update in one transaction (the day22 David example)
+  - auth    → `register_user` then `login_user`
+- Per operation type: ops/sec, p50 / p95 / p99 latency in ms, and client CPU per
+  operation: `time.thread_time()` around each call, i.e. CPU of the calling thread
+  (BSON encode/decode, pool checkout). Work done on other threads (driver
+  monitors, the bcrypt pool used by `auth`) is not included.
+- Results are written as JSON after EVERY workload, so a failing workload keeps
+  the finished ones; `--compare old.json` prints the change per metric so
+  regressions show up between runs.
+- `MONGO_URI=mongomock://` runs everything against an in-memory stand-in, except
+  `txn` (needs a replica set), which is skipped.
+"""
+
+WORKLOADS = ("insert", "read", "mixed", "txn", "auth")
+NEEDS_REPLICA_SET = ("txn",)
+
+# ==========================================
+# 🔹 Latency Recorder
+# ==========================================
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples = {}
+        self.cpu_samples = {}
+
+    def time(self, op_type, func, *args, **kwargs):
+        cpu_start, start = time.thread_time(), time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed, cpu = time.perf_counter() - start, time.thread_time() - cpu_start
+        # list.append is atomic under the GIL, safe from many threads
+        self.samples.setdefault(op_type, []).append(elapsed)
+        self.cpu_samples.setdefault(op_type, []).append(cpu)
+        return result
+
+    def summary(self, elapsed):
+        report = {}
+        for op_type, values in self.samples.items():
+            values.sort()
+            cpu = self.cpu_samples[op_type]
+            report[op_type] = {
+                "ops": len(values),
+                "ops_per_sec": round(len(values) / elapsed, 1),
+                "p50_ms": round(1000 * percentile(values, 0.50), 3),
+                "p95_ms": round(1000 * percentile(values, 0.95), 3),
+                "p99_ms": round(1000 * percentile(values, 0.99), 3),
+                "cpu_us_per_op": round(1e6 * sum(cpu) / len(cpu), 2),
+            }
+        return report
+
+# ==========================================
+# 🔹 Workloads
+# ==========================================
+def _seed(collection, count):
+    collection.drop()
+    collection.insert_many([{"name": f"user_{i}", "age": 18 + i % 60, "city": "Chicago", "balance": 500}
+                            for i in range(count)])
+    collection.create_index("name")
+
+
+def run_workload(name, operations=10000, threads=8, seed_docs=10000):
+    client = get_client()
+    collection = client[DEFAULT_DB]["users_bench"]
+    recorder = LatencyRecorder()
+    _seed(collection, seed_docs)
+
+    def one_op(i):
+        key = f"user_{random.randrange(seed_docs)}"
+        if name == "insert":
+            recorder.time("insert_one", collection.insert_one, {"name": f"new_{i}", "age": 30, "city": "Chicago"})
+        elif name == "read":
+            recorder.time("find_one", collection.find_one, {"name": key})
+        elif name == "mixed":
+            if i % 2:
+                update = {"$inc": {"balance": 1}} if i % 4 == 1 else {"$set": {"city": "Houston"}}
+                recorder.time("update_one", collection.update_one, {"name": key}, update)
+            else:
+                recorder.time("delete_one", collection.delete_one, {"name": key})
+                recorder.time("insert_one", collection.insert_one, {"name": key, "balance": 500})
+        elif name == "txn":
+            recorder.time("transaction", _transaction, client, collection, f"txn_{i}")
+        elif name == "auth":
+            # Cheap hashes for this call only: measure the db path, not bcrypt cost
+            recorder.time("register_user", register_user, f"auth_{i}", "secure123", collection, rounds=4)
+            recorder.time("login_user", login_user, f"auth_{i}", "secure123", collection)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one_op, range(operations)))
+    elapsed = time.perf_counter() - start
+
+    collection.drop()
+    return recorder.summary(elapsed)
+
+
+def _transaction(client, collection, name):
+    with client.start_session() as session:
+        with session.start_transaction():
+            collection.insert_one({"name": name, "balance": 500}, session=session)
+            collection.update_one({"name": name}, {"$inc": {"balance": -200}}, session=session)
+
+# ==========================================
+# 🔹 JSON Results & Regression Compare
+# ==========================================
+def compare(current, previous_path):
+    with open(previous_path, "r") as file:
+        previous = json.load(file)["results"]
+    print(f"\n📌 Compared with {previous_path}:")
+    for workload, ops in current.items():
+        for op_type, metrics in ops.items():
+            old = previous.get(workload, {}).get(op_type)
+            if not old:
+                continue
+            for metric in ("ops_per_sec", "p99_ms", "cpu_us_per_op"):
+                if old[metric]:
+                    change = 100 * (metrics[metric] - old[metric]) / old[metric]
+                    print(f"  {workload}/{op_type} {metric}: {old[metric]} → {metrics[metric]} ({change:+.1f}%)")
+
+
+def _save_results(args, results):
+    temp_path = args.output + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "uri": DEFAULT_URI,
+            "python": sys.version.split()[0],
+            "machine": platform.platform(),
+            "config": vars(args),
+            "results": results,
+        }, file, indent=2)
+    os.replace(temp_path, args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="day22 CRUD benchmark")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--ops", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seed-docs", type=int, default=10000)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for workload in args.workloads.split(","):
+        if workload in NEEDS_REPLICA_SET and DEFAULT_URI.startswith("mongomock://"):
+            print(f"⚠️ Skipping '{workload}': needs a replica set, not mongomock")
+            continue
+        print(f"📌 Running '{workload}'...")
+        results[workload] = run_workload(workload, args.ops, args.threads, args.seed_docs)
+        for op_type, metrics in results[workload].items():
+            print(f"✅ {op_type}: {metrics}")
+        _save_results(args, results)  # After each workload: a later crash keeps these
+    print(f"\n✅ Results saved to '{args.output}'")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Username Bloom Filter - Reject Unknown Usernames Without a Query
+"""
+
+import os
+import math
+import time
+import struct
+import hashlib
+import threading
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+from com.niteshsynergy.db.day22Hashing import hash_password, login_user as db_login_user
+
+# ==========================================
+# 🔹 What a Bloom Filter Gives Us
+# ==========================================
+"""
+- A bit array + k hash functions. `add(x)` sets k bits; `x in bloom` checks them.
+- "Not in the filter" is right for every username the filter has seen → a login
+  for a username that never existed is rejected without touching MongoDB
+  (credential-stuffing traffic).
+- "In the filter" may be a false positive (rate chosen up front) → the database
+  is asked as usual.
+- Size from target false-positive rate p and expected users n:
+  bits m = -n·ln(p) / ln(2)²,  hashes k = (m / n)·ln(2).
+  1M users at p = 0.1% → ~1.7 MB.
+- Built by one streaming scan of `username` only, updated on every register, and
+  saved to disk so a restart loads it in milliseconds instead of rescanning.
+- The filter only knows users registered through it. Each saved filter records a
+  snapshot of the collection (document count + highest ObjectId `_id`).
+  `UsernameGuard` compares that snapshot with the collection on load and at most
+  every `check_interval` seconds: on a mismatch (users registered by another
+  process, by `day22.register_user`, or after a crash before the last save) it
+  answers "maybe" for everything → logins go to the database while a fresh
+  filter is rebuilt in the background. Only inside one `check_interval` can a
+  user registered elsewhere be rejected; `check_interval=0` checks every time.
+- Deleting a user does NOT remove it from the filter (Bloom filters can't);
+  such usernames simply fall through to the database.
+"""
+
+_HEADER = struct.Struct("<4sQIQQ12s")  # magic, bits, hashes, items, source count, source max _id
+_MAGIC = b"BLM2"
+_NO_ID = b"\0" * 12
+
+# ==========================================
+# 🔹 Bloom Filter
+# ==========================================
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be > 0 and error_rate between 0 and 1")
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        # Collection snapshot this filter reflects (see UsernameGuard)
+        self.source_count = 0
+        self.source_max_id = _NO_ID
+
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_error_rate(self):
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    # ==========================================
+    # 🔹 Persistence (warm start)
+    # ==========================================
+    def save(self, path):
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count,
+                                    self.source_count, self.source_max_id))
+            file.write(self.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size or header[:4] != _MAGIC:
+                raise ValueError(f"'{path}' is not a Bloom filter file")
+            magic, num_bits, num_hashes, count, source_count, source_max_id = _HEADER.unpack(header)
+            bloom = cls.__new__(cls)
+            bloom.num_bits, bloom.num_hashes, bloom.count = num_bits, num_hashes, count
+            bloom.source_count, bloom.source_max_id = source_count, source_max_id
+            bloom.bits = bytearray(file.read())
+        if len(bloom.bits) != (num_bits + 7) // 8:
+            raise ValueError(f"'{path}' is truncated")
+        return bloom
+
+# ==========================================
+# 🔹 Building from the users Collection
+# ==========================================
+def _id_bytes(value):
+    return value.binary if isinstance(value, ObjectId) else _NO_ID
+
+
+def collection_snapshot(collection):
+    """(document count, highest ObjectId `_id` as 12 bytes) — two cheap metadata / index reads."""
+    last = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    return collection.estimated_document_count(), _id_bytes(last["_id"]) if last else _NO_ID
+
+
+def build_from_collection(collection=None, field="username", capacity=None, error_rate=0.001, headroom=1.5):
+    collection = collection if collection is not None else get_collection("users")
+    # Snapshot BEFORE the scan: users added during the scan make it look stale, never fresh
+    source_count, source_max_id = collection_snapshot(collection)
+    # Headroom leaves space for new registrations before the error rate degrades
+    capacity = capacity or max(1000, int(source_count * headroom))
+    bloom = BloomFilter(capacity, error_rate)
+    for document in collection.find({field: {"$type": "string"}}, {field: 1, "_id": 0}, batch_size=10000):
+        bloom.add(document[field])
+    bloom.source_count, bloom.source_max_id = source_count, source_max_id
+    return bloom
+
+# ==========================================
+# 🔹 Guarded Register / Login
+# ==========================================
+class UsernameGuard:
+    def __init__(self, collection=None, path="usernames.bloom", error_rate=0.001,
+                 check_interval=1.0, save_interval=5.0):
+        self.collection = collection if collection is not None else get_collection("users")
+        self.path = path
+        self.error_rate = error_rate
+        self.check_interval = check_interval
+        self.save_interval = save_interval
+        self.rejected_without_query = 0
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+        self._rebuilding = None  # Background rebuild thread while the filter is stale
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._last_check = float("-inf")
+        self.bloom = None
+        if path and os.path.exists(path):
+            try:
+                self.bloom = BloomFilter.load(path)
+            except ValueError:  # Old format / truncated → rebuild
+                self.bloom = None
+        if self.bloom is None or not self._is_current():
+            self._rebuild()
+        self._last_check = time.monotonic()
+
+    # --- Freshness ---
+    def _is_current(self):
+        snapshot = collection_snapshot(self.collection)
+        with self._lock:
+            return snapshot == (self.bloom.source_count, self.bloom.source_max_id)
+
+    def _rebuild(self):
+        bloom = build_from_collection(self.collection, error_rate=self.error_rate)
+        with self._lock:
+            self.bloom = bloom
+            self.rebuilds += 1
+        self.save()
+
+    def _rebuild_in_background(self):
+        try:
+            self._rebuild()
+        finally:
+            with self._lock:
+                self._rebuilding = None
+
+    def is_stale(self):
+        """True while a rebuild runs, or if the collection changed behind our back."""
+        with self._lock:
+            if self._rebuilding is not None:
+                return True
+            due = time.monotonic() - self._last_check >= self.check_interval
+        if not due:
+            return False
+        current = self._is_current()
+        with self._lock:
+            self._last_check = time.monotonic()
+            if current or self._rebuilding is not None:
+                return not current
+            self._rebuilding = threading.Thread(target=self._rebuild_in_background, daemon=True)
+            self._rebuilding.start()
+        return True
+
+    # --- Persistence ---
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            bloom, self._dirty = self.bloom, False
+            self._last_save = time.monotonic()
+            bloom.save(self.path)
+
+    def _save_if_due(self):
+        with self._lock:
+            due = self._dirty and time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def close(self):
+        rebuilding = self._rebuilding
+        if rebuilding is not None:
+            rebuilding.join()
+        if self._dirty:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Guarded operations ---
+    def might_exist(self, username):
+        with self._lock:
+            if username in self.bloom:
+                return True
+        return self.is_stale()  # Stale filter → "maybe", ask the database
+
+    def register_user(self, username, password):
+        if self.might_exist(username) and self.collection.find_one({"username": username}, {"_id": 1}):
+            return False
+        try:
+            result = self.collection.insert_one({"username": username, "password": hash_password(password)})
+        except DuplicateKeyError:  # Lost a race with another registration
+            with self._lock:
+                self.bloom.add(username)
+                self._dirty = True
+            return False
+        with self._lock:
+            self.bloom.add(username)
+            # Keep the snapshot in step with our own insert, so it does not look stale
+            self.bloom.source_count += 1
+            self.bloom.source_max_id = max(self.bloom.source_max_id, _id_bytes(result.inserted_id))
+            self._dirty = True
+        self._save_if_due()
+        return True
+
+    def login_user(self, username, password):
+        if not self.might_exist(username):
+            self.rejected_without_query += 1
+            return False
+        return db_login_user(username, password, self.collection)
+
+
+if __name__ == "__main__":
+    bloom = BloomFilter(1_000_000, 0.001)
+    print(f"\n📌 Bloom for 1M users @0.1%: {len(bloom.bits) / 2**20:.2f} MB, k={bloom.num_hashes}")
+    for i in range(1_000_000):
+        bloom.add(f"user_{i}")
+    false_positives = sum(f"stranger_{i}" in bloom for i in range(100_000))
+    print(f"✅ Measured false-positive rate: {false_positives / 100_000:.4%}")
+
+    start = time.perf_counter()
+    bloom.save("usernames.bloom")
+    BloomFilter.load("usernames.bloom")
+    print(f"✅ Save + warm load: {1000 * (time.perf_counter() - start):.1f} ms")
+    os.remove("usernames.bloom")
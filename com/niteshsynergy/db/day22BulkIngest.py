@@ -0,0 +1,134 @@
+"""
+MongoDB Bulk Ingest - Streaming, Batched insert_many Pipeline
+"""
+
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from pymongo.errors import BulkWriteError
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why Batch Inserts?
+# ==========================================
+"""
+- `insert_one()` costs one network round trip per document.
+- `insert_many(batch, ordered=False)` sends a whole batch in one command, and the
+  server keeps inserting past a failing document instead of stopping at it.
+- Batches are cut lazily from any iterable / generator, so the full data set is
+  never held in memory.
+- At most `max_in_flight` batches are on the wire at once → memory stays bounded
+  (roughly `batch_size * max_in_flight` documents).
+"""
+
+# ==========================================
+# 🔹 Splitting Any Iterable into Batches
+# ==========================================
+def iter_batches(documents, batch_size):
+    iterator = iter(documents)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+# ==========================================
+# 🔹 Ingest Statistics (Latency & Throughput)
+# ==========================================
+class IngestStats:
+    def __init__(self):
+        self.inserted = 0
+        self.errors = 0
+        self.batch_latencies = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, inserted, errors, latency):
+        self.inserted += inserted
+        self.errors += errors
+        self.batch_latencies.append(latency)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def docs_per_sec(self):
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        latencies = sorted(self.batch_latencies) or [0.0]
+        return {
+            "inserted": self.inserted,
+            "errors": self.errors,
+            "batches": len(self.batch_latencies),
+            "elapsed_s": round(self.elapsed, 3),
+            "docs_per_sec": round(self.docs_per_sec, 1),
+            "batch_ms_avg": round(1000 * sum(latencies) / len(latencies), 2),
+            "batch_ms_max": round(1000 * latencies[-1], 2),
+        }
+
+# ==========================================
+# 🔹 Sending One Batch
+# ==========================================
+def _insert_batch(collection, batch):
+    start = time.perf_counter()
+    try:
+        result = collection.insert_many(batch, ordered=False)
+        inserted, errors = len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        # Unordered: every valid document was still written, only the bad ones failed
+        inserted = e.details.get("nInserted", 0)
+        errors = len(e.details.get("writeErrors", []))
+    return inserted, errors, time.perf_counter() - start
+
+# ==========================================
+# 🔹 Streaming Bulk Insert
+# ==========================================
+def bulk_insert(collection, documents, batch_size=1000, max_in_flight=4, on_batch=None):
+    """Insert `documents` (any iterable) in unordered batches, with at most
+    `max_in_flight` batches outstanding. `on_batch(inserted, errors, latency)` is
+    called after each batch. Returns an `IngestStats`."""
+    stats = IngestStats()
+
+    def collect(future):
+        inserted, errors, latency = future.result()
+        stats.record(inserted, errors, latency)
+        if on_batch:
+            on_batch(inserted, errors, latency)
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for batch in iter_batches(documents, batch_size):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            pending.add(executor.submit(_insert_batch, collection, batch))
+        for future in pending:
+            collect(future)
+
+    stats.finish()
+    return stats
+
+
+def generate_users(count, start=0):
+    cities = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"]
+    for i in range(start, start + count):
+        yield {"name": f"user_{i}", "age": 18 + i % 60, "city": cities[i % len(cities)]}
+
+# ==========================================
+# 🔹 Tuning Batch Size (Run This File)
+# ==========================================
+if __name__ == "__main__":
+    collection = get_collection("users_ingest")  # MONGO_URI=mongomock:// for an in-memory run
+
+    print("\n📌 Bulk Ingest Benchmark:")
+    for batch_size in (100, 1000, 5000):
+        collection.drop()
+        stats = bulk_insert(collection, generate_users(100_000), batch_size=batch_size)
+        print(f"✅ batch_size={batch_size}: {stats.summary()}")
+
+    collection.drop()
+    print("\n✅ Ingest Collection Dropped!")
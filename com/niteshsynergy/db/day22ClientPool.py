@@ -0,0 +1,221 @@
+"""
+MongoDB Client Pool - One Shared, Tuned MongoClient per URI
+"""
+
+import os
+import time
+import threading
+import importlib.util
+
+from pymongo import MongoClient, monitoring
+
+# ==========================================
+# 🔹 Why a Shared Client?
+# ==========================================
+"""
+- A `MongoClient` owns a connection pool, so it should be created ONCE per process
+  and reused, not built at import time or per request.
+- `get_client(uri)` lazily creates one tuned client per URI and caches it.
+- `get_collection(name)` caches the collection handle, so hot paths don't re-resolve
+  `db["users"]` on every call.
+- After `fork()`, the child drops every inherited client: sockets must never be
+  shared between processes (e.g. ProcessPoolExecutor workers).
+- `pool_wait_stats()` exposes how long threads waited to check out a connection.
+  Growing waits mean the pool is starved → raise maxPoolSize or reduce concurrency.
+- A `mongomock://` URI returns an in-memory mongomock client (tests / benchmarks).
+"""
+
+DEFAULT_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
+DEFAULT_DB = "test_db"
+
+
+def _available_compressors():
+    # pymongo warns for every listed compressor whose package is missing → list only
+    # the installed ones, best first (zlib is in the standard library)
+    names = [name for name, module in (("zstd", "zstandard"), ("snappy", "snappy"))
+             if importlib.util.find_spec(module) is not None]
+    return ",".join(names + ["zlib"])
+
+
+POOL_OPTIONS = {
+    "maxPoolSize": 100,
+    "minPoolSize": 10,
+    "waitQueueTimeoutMS": 2000,
+    "maxIdleTimeMS": 60000,
+    "compressors": _available_compressors(),
+}
+
+# ==========================================
+# 🔹 Pool Checkout Wait Metric
+# ==========================================
+class PoolWaitMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._clear()
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def reset_after_fork(self):
+        # Another thread may have held the old lock at fork time: never acquire it
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._clear()
+
+    def _clear(self):
+        self.checkouts = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _record(self, waited, failed=False):
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    # Checkout happens on the calling thread, so a thread-local start time is enough
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self._record(time.perf_counter() - started)
+
+    def connection_check_out_failed(self, event):
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self._record(time.perf_counter() - started, failed=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "failures": self.failures,
+                "wait_ms_avg": round(1000 * self.total_wait / max(self.checkouts + self.failures, 1), 3),
+                "wait_ms_max": round(1000 * self.max_wait, 3),
+            }
+
+    # Remaining pool events are not needed for the wait metric
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_checked_in(self, event): pass
+
+
+pool_monitor = PoolWaitMonitor()
+
+# ==========================================
+# 🔹 Process-wide Client Registry
+# ==========================================
+_lock = threading.Lock()
+_clients = {}
+_client_options = {}  # uri → options the client was created with
+_collections = {}
+_owner_pid = os.getpid()
+
+
+def _reset_after_fork():
+    # Runs in the child: forget the parent's clients WITHOUT closing them,
+    # closing would touch sockets the parent is still using.
+    global _lock, _owner_pid
+    _lock = threading.Lock()
+    _clients.clear()
+    _client_options.clear()
+    _collections.clear()
+    _owner_pid = os.getpid()
+    pool_monitor.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _check_options(uri, options):
+    # Without options any caller shares the client; with options they must match
+    if options and options != _client_options.get(uri):
+        raise ValueError(f"A client for '{uri}' already exists with options "
+                         f"{_client_options.get(uri)}; requested {options}")
+
+
+def get_client(uri=None, **options):
+    """Return the shared client for `uri`, creating it on first use.
+    Options only apply when the client is created; different options for an
+    existing client raise ValueError instead of being ignored."""
+    uri = uri or DEFAULT_URI
+    if os.getpid() != _owner_pid:  # Fallback for platforms without register_at_fork
+        _reset_after_fork()
+    client = _clients.get(uri)
+    if client is not None:
+        _check_options(uri, options)
+        return client
+    with _lock:
+        client = _clients.get(uri)
+        if client is not None:
+            _check_options(uri, options)
+        else:
+            if uri.startswith("mongomock://"):
+                import mongomock
+                client = mongomock.MongoClient()
+            else:
+                settings = {**POOL_OPTIONS, **options}
+                client = MongoClient(uri, event_listeners=[pool_monitor], **settings)
+            _clients[uri] = client
+            _client_options[uri] = options
+    return client
+
+
+def get_collection(name="users", db_name=DEFAULT_DB, uri=None):
+    """Return a cached collection handle from the shared client."""
+    uri = uri or DEFAULT_URI
+    key = (uri, db_name, name)
+    collection = _collections.get(key)
+    if collection is None:
+        collection = get_client(uri)[db_name][name]
+        _collections[key] = collection
+    return collection
+
+
+def pool_wait_stats():
+    return pool_monitor.stats()
+
+
+def close_all():
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _client_options.clear()
+        _collections.clear()
+
+# ==========================================
+# 🔹 Pool Starvation Demo (Run This File)
+# ==========================================
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    users = get_collection("users")
+    users.insert_one({"name": "Alice", "age": 25, "city": "New York"})
+
+    def lookup(_):
+        return get_collection("users").find_one({"name": "Alice"})
+
+    print("\n📌 Pool Checkout Wait (threads vs pool size):")
+    for threads in (10, 100, 300):
+        pool_monitor.reset()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lookup, range(5000)))
+        print(f"✅ threads={threads}: {pool_wait_stats()}")
+
+    users.drop()
+    close_all()
@@ -0,0 +1,207 @@
+"""
+Compact User Encoding - Short Keys, Small Ints & Packed bcrypt Hashes
+"""
+
+import re
+import time
+import base64
+
+import bson
+from bson.binary import Binary
+from bson.int64 import Int64
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why a Compact Encoding?
+# ==========================================
+"""
+- BSON stores every field NAME inside every document: "username" costs 9 bytes
+  per user, "u" costs 2. Smaller documents → more of them fit in the server's
+  cache, and less data crosses the network.
+- Numbers: integral floats and Int64 values that fit are stored as int32
+  (4 bytes instead of 8); numeric strings from CSV imports become ints.
+- A bcrypt hash is 60 ASCII chars (`$2b$12$` + 53 base64 chars). Packed, it is
+  41 bytes: version (1) + cost (1) + salt (16) + hash (23), stored as Binary
+  with a fixed user-defined subtype so it can always be recognised.
+- `CompactUsers` wraps a collection: callers keep using long field names, the
+  wrapper translates filters, updates and results in both directions.
+- `measure()` compares average BSON size, storage size and scan speed.
+"""
+
+FIELD_MAP = {
+    "username": "u",
+    "password": "p",
+    "name": "n",
+    "age": "a",
+    "city": "c",
+    "balance": "b",
+}
+REVERSE_FIELD_MAP = {short: long for long, short in FIELD_MAP.items()}
+
+BCRYPT_SUBTYPE = 0x80  # First user-defined BSON binary subtype
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+_INT_STRING = re.compile(r"-?[0-9]+")  # ASCII only: isdigit() also accepts "²", which int() rejects
+
+# ==========================================
+# 🔹 bcrypt Hash Packing (60 chars → 41 bytes)
+# ==========================================
+_BCRYPT_ALPHABET = b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_STD_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_TO_STD = bytes.maketrans(_BCRYPT_ALPHABET, _STD_ALPHABET)
+_TO_BCRYPT = bytes.maketrans(_STD_ALPHABET, _BCRYPT_ALPHABET)
+
+
+def _b64_decode(text, length):
+    padded = text.translate(_TO_STD) + b"=" * (-len(text) % 4)
+    return base64.b64decode(padded)[:length]
+
+
+def _b64_encode(data, chars):
+    return base64.b64encode(data).translate(_TO_BCRYPT)[:chars]
+
+
+def pack_bcrypt(hashed):
+    if isinstance(hashed, str):
+        hashed = hashed.encode()
+    # b"$2b$12$" + 22 salt chars + 31 hash chars
+    if len(hashed) != 60 or hashed[:2] != b"$2" or hashed[3:4] != b"$" or hashed[6:7] != b"$":
+        raise ValueError("Not a bcrypt hash")
+    version, cost = hashed[2:3], int(hashed[4:6])
+    salt = _b64_decode(hashed[7:29], 16)
+    digest = _b64_decode(hashed[29:], 23)
+    return Binary(version + bytes([cost]) + salt + digest, BCRYPT_SUBTYPE)
+
+
+def unpack_bcrypt(packed):
+    packed = bytes(packed)
+    version, cost = packed[0:1], packed[1]
+    salt, digest = packed[2:18], packed[18:41]
+    return b"$2" + version + b"$" + b"%02d" % cost + b"$" + _b64_encode(salt, 22) + _b64_encode(digest, 31)
+
+# ==========================================
+# 🔹 Field & Value Encoding
+# ==========================================
+def _pack_value(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer() and INT32_MIN <= value <= INT32_MAX:
+        return int(value)
+    if isinstance(value, Int64) and INT32_MIN <= value <= INT32_MAX:
+        return int(value)
+    if isinstance(value, str) and _INT_STRING.fullmatch(value) and INT32_MIN <= int(value) <= INT32_MAX:
+        return int(value)
+    return value
+
+
+def _short_path(path):
+    # Dotted paths: only the top-level field is renamed ("city.zip" → "c.zip")
+    head, dot, rest = path.partition(".")
+    return FIELD_MAP.get(head, head) + dot + rest
+
+
+def encode_fields(value):
+    """Rename long field names inside documents, filters and update specs."""
+    if isinstance(value, dict):
+        return {key if key.startswith("$") else _short_path(key): encode_fields(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [encode_fields(item) for item in value]
+    return value
+
+
+def encode_user(document):
+    encoded = {}
+    for key, value in document.items():
+        if key == "password" and isinstance(value, (bytes, str)) and not isinstance(value, Binary):
+            value = pack_bcrypt(value)
+        elif key in ("age", "balance"):
+            value = _pack_value(value)
+        encoded[FIELD_MAP.get(key, key)] = value
+    return encoded
+
+
+def decode_user(document):
+    if document is None:
+        return None
+    decoded = {}
+    for key, value in document.items():
+        if isinstance(value, Binary) and value.subtype == BCRYPT_SUBTYPE:
+            value = unpack_bcrypt(value)
+        decoded[REVERSE_FIELD_MAP.get(key, key)] = value
+    return decoded
+
+# ==========================================
+# 🔹 Collection Wrapper
+# ==========================================
+class CompactUsers:
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else get_collection("users")
+
+    def insert_one(self, document):
+        return self.collection.insert_one(encode_user(document))
+
+    def insert_many(self, documents, ordered=False):
+        return self.collection.insert_many((encode_user(d) for d in documents), ordered=ordered)
+
+    def find_one(self, query=None, projection=None):
+        return decode_user(self.collection.find_one(encode_fields(query or {}), encode_fields(projection)))
+
+    def find(self, query=None, projection=None, **kwargs):
+        for document in self.collection.find(encode_fields(query or {}), encode_fields(projection), **kwargs):
+            yield decode_user(document)
+
+    def update_one(self, query, update, **kwargs):
+        update = dict(update)
+        if "$set" in update:
+            update["$set"] = encode_user(update["$set"])
+        return self.collection.update_one(encode_fields(query), encode_fields(update), **kwargs)
+
+    def delete_one(self, query):
+        return self.collection.delete_one(encode_fields(query))
+
+# ==========================================
+# 🔹 Measuring Size & Scan Speed
+# ==========================================
+def measure(collection, sample_size=1000):
+    sample = list(collection.find().limit(sample_size))
+    avg_bson = sum(len(bson.encode(document)) for document in sample) / max(len(sample), 1)
+    storage = next(collection.aggregate([{"$collStats": {"storageStats": {}}}]), {}).get("storageStats", {})
+    start = time.perf_counter()
+    scanned = sum(1 for _ in collection.find(batch_size=5000))
+    elapsed = time.perf_counter() - start
+    return {
+        "documents": scanned,
+        "avg_bson_bytes": round(avg_bson, 1),
+        "data_size_mb": round(storage.get("size", 0) / 2 ** 20, 2),
+        "storage_size_mb": round(storage.get("storageSize", 0) / 2 ** 20, 2),
+        "scan_docs_per_sec": round(scanned / elapsed) if elapsed else 0,
+    }
+
+
+if __name__ == "__main__":
+    import bcrypt
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert
+
+    hashed = bcrypt.hashpw(b"secure123", bcrypt.gensalt(4))
+    assert unpack_bcrypt(pack_bcrypt(hashed)) == hashed
+    print(f"\n📌 bcrypt hash: {len(hashed)} bytes → packed {len(pack_bcrypt(hashed))} bytes")
+
+    def users(count):
+        for i in range(count):
+            yield {"username": f"user_{i}", "password": hashed, "name": f"User {i}",
+                   "age": float(18 + i % 60), "city": "Los Angeles", "balance": Int64(500 + i)}
+
+    plain, compact = get_collection("users_plain"), get_collection("users_compact")
+    plain.drop()
+    compact.drop()
+    bulk_insert(plain, users(200_000))
+    bulk_insert(compact, (encode_user(user) for user in users(200_000)))
+
+    print("✅ Plain  :", measure(plain))
+    print("✅ Compact:", measure(compact))
+    login = CompactUsers(compact).find_one({"username": "user_7"})
+    print("✅ Compact login works:", bcrypt.checkpw(b"secure123", login["password"]))
+
+    plain.drop()
+    compact.drop()
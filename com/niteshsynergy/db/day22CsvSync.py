@@ -0,0 +1,158 @@
+"""
+CSV → MongoDB Sync - Streaming, Batched Upserts with Change Detection
+"""
+
+import re
+import csv
+import time
+import hashlib
+import argparse
+import itertools
+
+from bson import json_util
+from pymongo import ASCENDING, UpdateOne
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 How the Sync Works
+# ==========================================
+"""
+- The CSV (e.g. `data.csv` from day20: Name, Age, City) is read row by row with
+  `csv.DictReader` → memory is O(batch), never O(file).
+- Headers become day22 field names (`Name` → `name`) and values are converted:
+  explicit `types` first, otherwise int → float → str. Guessing only accepts plain
+  decimal numbers ("25", "-3.5", "1e3"): "NaN", "Inf", "1_000" or " 7 " stay text.
+- Short rows get None for the missing columns; rows with MORE fields than the
+  header are skipped and counted as `skipped_malformed`.
+- Every row gets a content hash (`_sync_hash`). Per batch, ONE query fetches the
+  stored hashes of that batch's keys; rows whose hash did not change are skipped.
+- Changed / new rows are sent as `UpdateOne(..., upsert=True)` in one unordered
+  `bulk_write` per batch.
+- The key column is indexed before the sync, otherwise every hash lookup and
+  upsert would be a collection scan.
+"""
+
+CONVERTERS = {"int": int, "float": float, "str": str}
+_INT = re.compile(r"[+-]?[0-9]+")
+_FLOAT = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+# ==========================================
+# 🔹 Row Conversion & Hashing
+# ==========================================
+def convert_value(value, converter=None):
+    if value is None or value == "":  # None: column missing from a short row
+        return None
+    if converter:
+        return converter(value)
+    if _INT.fullmatch(value):
+        return int(value)
+    if _FLOAT.fullmatch(value):
+        return float(value)
+    return value
+
+
+def convert_row(row, types=None, rename=str.lower):
+    if None in row:  # DictReader puts extra fields under the key None
+        raise ValueError(f"Row has more fields than the header: {row[None]}")
+    types = types or {}
+    return {rename(column): convert_value(value, types.get(column)) for column, value in row.items()}
+
+
+def row_hash(document):
+    return hashlib.sha1(json_util.dumps(document, sort_keys=True).encode()).hexdigest()
+
+# ==========================================
+# 🔹 Key Index
+# ==========================================
+def ensure_key_index(collection, key):
+    for index in collection.index_information().values():
+        if index["key"] == [(key, ASCENDING)]:
+            return
+    collection.create_index([(key, ASCENDING)], name=key)
+
+# ==========================================
+# 🔹 Syncing One Batch
+# ==========================================
+def _sync_batch(collection, key, batch, stats):
+    # Later rows with the same key win, like re-applying the CSV top to bottom
+    latest = {document[key]: document for document in batch}
+    stored = {
+        existing[key]: existing.get("_sync_hash")
+        for existing in collection.find({key: {"$in": list(latest)}}, {key: 1, "_sync_hash": 1})
+    }
+
+    operations = []
+    for key_value, document in latest.items():
+        digest = row_hash(document)
+        if stored.get(key_value) == digest:
+            stats["unchanged"] += 1
+            continue
+        operations.append(UpdateOne({key: key_value}, {"$set": {**document, "_sync_hash": digest}}, upsert=True))
+
+    if operations:
+        result = collection.bulk_write(operations, ordered=False)
+        stats["upserted"] += result.upserted_count
+        stats["modified"] += result.modified_count
+
+# ==========================================
+# 🔹 Streaming Sync
+# ==========================================
+def sync_csv(path, collection=None, key_column="Name", types=None, batch_size=1000, rename=str.lower):
+    """Upsert the rows of the CSV at `path` into `collection`. Returns stats."""
+    collection = collection if collection is not None else get_collection("users")
+    key = rename(key_column)
+    ensure_key_index(collection, key)
+    stats = {"rows": 0, "skipped_no_key": 0, "skipped_malformed": 0, "upserted": 0, "modified": 0, "unchanged": 0}
+    start = time.perf_counter()
+
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        if key_column not in (reader.fieldnames or []):
+            raise ValueError(f"Key column '{key_column}' not in CSV header {reader.fieldnames}")
+        while True:
+            rows = list(itertools.islice(reader, batch_size))
+            if not rows:
+                break
+            stats["rows"] += len(rows)
+            batch = [convert_row(row, types, rename) for row in rows if None not in row]
+            stats["skipped_malformed"] += len(rows) - len(batch)
+            keyed = [document for document in batch if document.get(key) is not None]
+            stats["skipped_no_key"] += len(batch) - len(keyed)
+            if keyed:
+                _sync_batch(collection, key, keyed, stats)
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["rows_per_sec"] = round(stats["rows"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def parse_types(specs):
+    # ["Age=int", "Balance=float"] → {"Age": int, "Balance": float}
+    types = {}
+    for spec in specs or []:
+        column, _, type_name = spec.partition("=")
+        if type_name not in CONVERTERS:
+            raise ValueError(f"Unknown type '{type_name}' for column '{column}'")
+        types[column] = CONVERTERS[type_name]
+    return types
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a CSV into MongoDB with upserts")
+    parser.add_argument("csv_path")
+    parser.add_argument("--key", default="Name", help="CSV column used as the upsert key")
+    parser.add_argument("--collection", default="users")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--type", action="append", dest="types", help="column=int|float|str")
+    args = parser.parse_args(argv)
+
+    stats = sync_csv(args.csv_path, get_collection(args.collection), args.key,
+                     parse_types(args.types), args.batch_size)
+    print(f"✅ Sync finished: {stats}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+MongoDB Export - Streaming, Projected, _id-Paginated Cursor Export
+"""
+
+import os
+import csv
+import time
+
+from bson import json_util
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why Not `for user in collection.find()`?
+# ==========================================
+"""
+- `find()` with no projection pulls and decodes EVERY field of every document.
+- `skip(n).limit(k)` pagination gets slower with each page: the server still walks
+  the first n documents.
+- Range pagination on `_id` (`{"_id": {"$gt": last_id}}` + sort on `_id`) uses the
+  `_id` index, so every page costs the same.
+- `export_collection()` writes each document as the cursor yields it → memory is
+  one cursor batch (`batch_size`), not one page. (`iter_pages()` returns whole
+  pages as lists, so it holds `page_size` documents.)
+- After each page the last `_id` and the output file's size are saved in a
+  checkpoint file. A re-run with the same checkpoint truncates the output back to
+  that size (dropping rows of an unfinished page and any half-written line) and
+  resumes exactly where the previous run stopped.
+"""
+
+# ==========================================
+# 🔹 Paginated Cursor Generator
+# ==========================================
+def _page_filter(query, last_id):
+    if last_id is None:
+        return query
+    after = {"_id": {"$gt": last_id}}
+    return {"$and": [query, after]} if query else after
+
+
+def _page_cursor(collection, query, projection, page_size, batch_size, last_id):
+    return (collection.find(_page_filter(query or {}, last_id), projection)
+            .sort("_id", 1)
+            .limit(page_size)
+            .batch_size(batch_size))
+
+
+def iter_pages(collection, query=None, projection=None, page_size=10000, batch_size=1000, after_id=None):
+    """Yield lists of documents ordered by `_id`, starting after `after_id`."""
+    if projection is not None and not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    last_id = after_id
+    while True:
+        page = list(_page_cursor(collection, query, projection, page_size, batch_size, last_id))
+        if not page:
+            return
+        yield page
+        last_id = page[-1]["_id"]
+        if len(page) < page_size:
+            return
+
+
+def iter_documents(collection, query=None, projection=None, page_size=10000, batch_size=1000, after_id=None):
+    for page in iter_pages(collection, query, projection, page_size, batch_size, after_id):
+        yield from page
+
+# ==========================================
+# 🔹 Checkpoint (Resume After Interruption)
+# ==========================================
+def load_checkpoint(path):
+    """Return `(last_id, exported, output_size)`; output_size is None if not recorded."""
+    if not path or not os.path.exists(path):
+        return None, 0, None
+    with open(path, "r") as file:
+        state = json_util.loads(file.read())
+    return state["last_id"], state["exported"], state.get("output_size")
+
+
+def save_checkpoint(path, last_id, exported, output_size):
+    # Write-then-rename so a crash never leaves a half-written checkpoint
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(json_util.dumps({"last_id": last_id, "exported": exported, "output_size": output_size}))
+    os.replace(temp_path, path)
+
+# ==========================================
+# 🔹 Export to NDJSON / CSV
+# ==========================================
+def export_collection(collection, output_path, fmt="ndjson", query=None, fields=None,
+                      page_size=10000, batch_size=1000, checkpoint_path=None):
+    """Stream `collection` to `output_path` as NDJSON or CSV. Returns rows written
+    in this run. With `checkpoint_path`, an interrupted export resumes and appends."""
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "csv" and not fields:
+        raise ValueError("CSV export needs an explicit list of fields")
+
+    last_id, exported, output_size = load_checkpoint(checkpoint_path)
+    resuming = last_id is not None
+    if resuming:
+        if output_size is None or not os.path.exists(output_path) or os.path.getsize(output_path) < output_size:
+            raise ValueError(f"Checkpoint '{checkpoint_path}' does not match '{output_path}'; "
+                             f"delete the checkpoint to export from scratch")
+        # Drop rows written after the last checkpoint (unfinished page, partial line)
+        os.truncate(output_path, output_size)
+    projection = {field: 1 for field in fields} if fields else None
+    written = 0
+
+    with open(output_path, "a" if resuming else "w", newline="", encoding="utf-8") as file:
+        writer = None
+        if fmt == "csv":
+            writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+            if not resuming:
+                writer.writeheader()
+
+        while True:
+            count = 0
+            # Iterate the cursor directly: only one cursor batch is in memory
+            for document in _page_cursor(collection, query, projection, page_size, batch_size, last_id):
+                if writer:
+                    writer.writerow(document)
+                else:
+                    file.write(json_util.dumps(document) + "\n")
+                last_id = document["_id"]
+                count += 1
+            if not count:
+                break
+            written += count
+            if checkpoint_path:
+                file.flush()
+                os.fsync(file.fileno())
+                save_checkpoint(checkpoint_path, last_id, exported + written, os.fstat(file.fileno()).st_size)
+            if count < page_size:
+                break
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # Finished: next run starts a fresh export
+    return written
+
+# ==========================================
+# 🔹 Export Demo (Run This File)
+# ==========================================
+if __name__ == "__main__":
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert, generate_users
+
+    users = get_collection("users_export")
+    users.drop()
+    bulk_insert(users, generate_users(50_000))
+
+    print("\n📌 Exporting users:")
+    for fmt in ("ndjson", "csv"):
+        start = time.perf_counter()
+        rows = export_collection(users, f"users.{fmt}", fmt=fmt, fields=["name", "city"],
+                                 checkpoint_path=f"users.{fmt}.checkpoint")
+        print(f"✅ {fmt}: {rows} rows in {time.perf_counter() - start:.2f}s")
+        os.remove(f"users.{fmt}")
+
+    users.drop()
@@ -0,0 +1,187 @@
+"""
+Password Hashing Pool - bcrypt Off the Request Thread, Bulk Registration
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import bcrypt
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+from com.niteshsynergy.db.day22BulkIngest import bulk_insert
+
+# ==========================================
+# 🔹 Why a Hashing Pool?
+# ==========================================
+"""
+- bcrypt is slow ON PURPOSE (tens of ms per hash) → inline hashing caps one thread
+  at a few dozen logins per second.
+- The `bcrypt` package releases the GIL while hashing, so a ThreadPoolExecutor
+  already uses every core. A ProcessPoolExecutor is available for hosts where
+  that is not the case.
+- `register_users_bulk()` hashes many passwords in parallel, then writes them with
+  ONE streaming bulk insert instead of one `insert_one()` per user.
+- `calibrate_rounds()` picks the bcrypt cost factor that fits a target latency on
+  THIS machine (each +1 round doubles the cost).
+- After `fork()` the child drops the inherited pool (its threads are gone) and
+  builds a fresh one on first use, like day22ClientPool does with its clients.
+"""
+
+DEFAULT_ROUNDS = 12
+
+_pool = None
+_pool_lock = threading.Lock()
+_rounds = DEFAULT_ROUNDS
+
+# ==========================================
+# 🔹 Pool Configuration
+# ==========================================
+def _new_pool(kind, workers):
+    if kind not in ("thread", "process"):
+        raise ValueError(f"Unknown pool kind: {kind}")
+    executor_class = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+    return executor_class(max_workers=workers or os.cpu_count())
+
+
+def configure_hash_pool(kind="thread", workers=None, rounds=None):
+    """Replace the hashing pool. `kind` is "thread" or "process"."""
+    global _pool, _rounds
+    pool = _new_pool(kind, workers)
+    with _pool_lock:
+        old, _pool = _pool, pool
+        if rounds is not None:
+            _rounds = rounds
+    if old is not None:
+        old.shutdown(wait=True)
+    return pool
+
+
+def get_hash_pool():
+    global _pool
+    pool = _pool
+    if pool is None:
+        with _pool_lock:
+            # Double-check: another first caller may have created it meanwhile
+            if _pool is None:
+                _pool = _new_pool("thread", None)
+            pool = _pool
+    return pool
+
+
+def _reset_after_fork():
+    # Runs in the child: the parent's worker threads do not exist here, so a
+    # submit() to the inherited pool would never run. Forget it WITHOUT shutting
+    # it down (that would wait on threads that are gone); the next call makes a new one.
+    global _pool, _pool_lock
+    _pool_lock = threading.Lock()
+    _pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Module-level functions so a ProcessPoolExecutor can pickle them
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds))
+
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password.encode(), hashed)
+
+# ==========================================
+# 🔹 Hash / Check on the Pool
+# ==========================================
+def hash_password_async(password, rounds=None):
+    return get_hash_pool().submit(_hash, password, rounds or _rounds)
+
+
+def check_password_async(password, hashed):
+    return get_hash_pool().submit(_check, password, hashed)
+
+
+def hash_password(password, rounds=None):
+    return hash_password_async(password, rounds).result()
+
+
+def check_password(password, hashed):
+    return check_password_async(password, hashed).result()
+
+# ==========================================
+# 🔹 Register & Login Using the Pool
+# ==========================================
+def register_user(username, password, collection=None, rounds=None):
+    collection = collection if collection is not None else get_collection("users")
+    collection.insert_one({"username": username, "password": hash_password(password, rounds)})
+
+
+def login_user(username, password, collection=None):
+    collection = collection if collection is not None else get_collection("users")
+    user = collection.find_one({"username": username}, {"password": 1})
+    return bool(user) and check_password(password, user["password"])
+
+
+def register_users_bulk(credentials, collection=None, batch_size=1000, rounds=None):
+    """Hash `(username, password)` pairs in parallel and insert them in bulk.
+    Returns the `IngestStats` of the insert."""
+    collection = collection if collection is not None else get_collection("users")
+    rounds = rounds or _rounds
+    pool = get_hash_pool()
+
+    def documents():
+        # Hash one batch at a time so memory stays O(batch_size)
+        batch = []
+        for pair in credentials:
+            batch.append(pair)
+            if len(batch) == batch_size:
+                yield from _hash_batch(pool, batch, rounds)
+                batch = []
+        if batch:
+            yield from _hash_batch(pool, batch, rounds)
+
+    return bulk_insert(collection, documents(), batch_size=batch_size)
+
+
+def _hash_batch(pool, batch, rounds):
+    hashes = pool.map(_hash, [p for _, p in batch], [rounds] * len(batch))
+    for (username, _), hashed in zip(batch, hashes):
+        yield {"username": username, "password": hashed}
+
+# ==========================================
+# 🔹 Cost-Factor Calibration
+# ==========================================
+def calibrate_rounds(target_ms=250, min_rounds=4, max_rounds=16, samples=3):
+    """Return the highest bcrypt rounds whose hash time stays within `target_ms`."""
+    best = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds)
+        start = time.perf_counter()
+        for _ in range(samples):
+            bcrypt.hashpw(b"calibration-password", salt)
+        elapsed_ms = 1000 * (time.perf_counter() - start) / samples
+        print(f"  rounds={rounds}: {elapsed_ms:.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        best = rounds
+    return best
+
+
+if __name__ == "__main__":
+    print("\n📌 Calibrating bcrypt rounds (target 100 ms):")
+    rounds = calibrate_rounds(target_ms=100)
+    print(f"✅ Using rounds={rounds}")
+    configure_hash_pool("thread", rounds=rounds)
+
+    users = get_collection("users_hashing")
+    users.drop()
+
+    print("\n📌 Bulk registration:")
+    stats = register_users_bulk(((f"user_{i}", f"pw_{i}") for i in range(2000)), users)
+    print(f"✅ {stats.summary()}")
+
+    print("\n📌 Login:")
+    print("✅ user_7 / pw_7:", login_user("user_7", "pw_7", users))          # True
+    print("❌ user_7 / wrong:", login_user("user_7", "wrong", users))        # False
+
+    users.drop()
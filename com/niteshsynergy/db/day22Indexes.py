@@ -0,0 +1,121 @@
+"""
+MongoDB Indexes - Declarative Index Spec, explain() Checks & Lookup Benchmark
+"""
+
+import time
+import random
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from com.niteshsynergy.db.day22ClientPool import get_client, DEFAULT_DB
+
+# ==========================================
+# 🔹 Why Indexes?
+# ==========================================
+"""
+- Without an index, `find_one({"username": ...})` is a COLLSCAN: the server reads
+  every document on every login → latency grows with the collection.
+- With an index it is an IXSCAN: a B-tree lookup, roughly constant time.
+- `username` gets a UNIQUE index, so duplicate registrations are rejected by the
+  server. It is partial (only string usernames), because day22 also stores plain
+  `{name, age, city}` documents that have no username.
+- `ensure_indexes()` is idempotent: call it at startup, existing indexes are kept.
+- `check_query_plans()` runs `explain()` on the query shapes this package uses
+  and flags any that still fall back to a COLLSCAN.
+"""
+
+INDEX_SPECS = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True,
+                   partialFilterExpression={"username": {"$type": "string"}}),
+        IndexModel([("name", ASCENDING)], name="name"),
+        IndexModel([("city", ASCENDING), ("age", ASCENDING)], name="city_age"),
+        IndexModel([("age", ASCENDING)], name="age"),                # age-bucket reports
+        IndexModel([("balance", DESCENDING)], name="balance_desc"),  # top-N by balance
+    ],
+}
+
+# Query shapes issued by day22.py: (collection, filter)
+QUERY_SHAPES = [
+    ("users", {"username": "john_doe"}),         # login_user
+    ("users", {"name": "Alice"}),                # find_one / update_one
+    ("users", {"name": "Charlie"}),              # delete_one
+    ("users", {"city": "Chicago", "age": 28}),   # city/age reports
+    ("users", {"age": {"$gte": 18, "$lt": 65}}), # age histogram (day22Reports)
+]
+
+# ==========================================
+# 🔹 Applying the Index Spec at Startup
+# ==========================================
+def ensure_indexes(db=None, specs=None):
+    db = db if db is not None else get_client()[DEFAULT_DB]
+    created = {}
+    for collection_name, models in (specs or INDEX_SPECS).items():
+        created[collection_name] = db[collection_name].create_indexes(models)
+    return created
+
+# ==========================================
+# 🔹 explain() - Finding COLLSCANs
+# ==========================================
+def _plan_stages(plan):
+    yield plan.get("stage")
+    if "inputStage" in plan:
+        yield from _plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+def explain_query(collection, query):
+    explanation = collection.find(query).explain()
+    winning_plan = explanation["queryPlanner"]["winningPlan"]
+    # Slot-based engine (MongoDB 7+) nests the classic plan under "queryPlan"
+    winning_plan = winning_plan.get("queryPlan", winning_plan)
+    stages = [stage for stage in _plan_stages(winning_plan) if stage]
+    return {"query": query, "stages": stages, "collscan": "COLLSCAN" in stages}
+
+
+def check_query_plans(db=None, shapes=None):
+    db = db if db is not None else get_client()[DEFAULT_DB]
+    reports = [explain_query(db[name], query) for name, query in (shapes or QUERY_SHAPES)]
+    for report in reports:
+        flag = "❌ COLLSCAN" if report["collscan"] else "✅ " + " → ".join(report["stages"])
+        print(f"{flag}: {report['query']}")
+    return reports
+
+# ==========================================
+# 🔹 Lookup Latency Before / After Indexing
+# ==========================================
+def time_lookups(collection, usernames):
+    start = time.perf_counter()
+    for username in usernames:
+        collection.find_one({"username": username})
+    return 1000 * (time.perf_counter() - start) / len(usernames)
+
+
+def benchmark_lookups(sizes=(10_000, 100_000, 1_000_000), lookups=200):
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert
+
+    db = get_client()[DEFAULT_DB]
+    collection = db["users_index_bench"]
+    results = []
+    for size in sizes:
+        collection.drop()
+        bulk_insert(collection, ({"username": f"user_{i}", "age": i % 80} for i in range(size)))
+        sample = [f"user_{random.randrange(size)}" for _ in range(lookups)]
+
+        before = time_lookups(collection, sample)
+        ensure_indexes(db, {"users_index_bench": INDEX_SPECS["users"]})
+        after = time_lookups(collection, sample)
+
+        results.append({"docs": size, "ms_no_index": round(before, 3), "ms_indexed": round(after, 3)})
+        print(f"✅ {size:>9} docs: {before:.3f} ms → {after:.3f} ms per lookup")
+    collection.drop()
+    return results
+
+
+if __name__ == "__main__":
+    print("\n📌 Ensuring indexes:", ensure_indexes())
+    print("\n📌 Query plans:")
+    check_query_plans()
+    print("\n📌 Lookup latency (before → after indexing):")
+    benchmark_lookups()
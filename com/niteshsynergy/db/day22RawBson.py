@@ -0,0 +1,134 @@
+"""
+Raw BSON Fast Path - Lazy Documents & Raw Batches for Large Result Sets
+"""
+
+import os
+import time
+import tracemalloc
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why Raw BSON?
+# ==========================================
+"""
+- `collection.find()` decodes every field of every document into a Python dict,
+  even when the documents are only forwarded somewhere else.
+- `RawBSONDocument` keeps the original bytes and decodes nothing until a key is
+  read. The FIRST key access (`doc["name"]`) decodes ALL top-level fields of that
+  document (embedded documents stay raw), so reading fields costs about as much as
+  a dict. The win is for documents that are only forwarded or stored: `doc.raw`
+  and writing it back to MongoDB use the bytes as-is.
+- `find_raw_batches()` returns each server batch as ONE `bytes` object of
+  concatenated BSON documents → no per-document Python objects at all.
+- Raw batches written back-to-back form a standard `.bson` dump file
+  (same layout as `mongodump`), readable with `bson.decode_file_iter`.
+"""
+
+RAW_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# ==========================================
+# 🔹 Lazy Documents
+# ==========================================
+def raw_collection(collection):
+    """Same collection, but reads return RawBSONDocument (decoded on first key access)."""
+    return collection.with_options(codec_options=RAW_OPTIONS)
+
+
+def iter_raw_documents(collection, query=None, projection=None, batch_size=1000):
+    yield from raw_collection(collection).find(query or {}, projection, batch_size=batch_size)
+
+# ==========================================
+# 🔹 Raw Batches (bytes only)
+# ==========================================
+def iter_raw_batches(collection, query=None, projection=None, batch_size=1000):
+    yield from collection.find_raw_batches(query or {}, projection, batch_size=batch_size)
+
+
+def split_raw_batch(batch):
+    # Slices the batch into RawBSONDocuments; fields stay undecoded
+    return bson.decode_all(batch, RAW_OPTIONS)
+
+
+def dump_raw(collection, path, query=None, batch_size=1000):
+    """Write matching documents to a `.bson` file without decoding them."""
+    count = 0
+    with open(path, "wb") as file:
+        for batch in iter_raw_batches(collection, query, batch_size=batch_size):
+            file.write(batch)
+            count += 1
+    return count
+
+
+def load_raw(path):
+    with open(path, "rb") as file:
+        yield from bson.decode_file_iter(file, RAW_OPTIONS)
+
+
+def copy_raw(source, target, query=None, batch_size=1000):
+    """Copy documents between collections as raw bytes (no dict round trip)."""
+    copied = 0
+    for batch in iter_raw_batches(source, query, batch_size=batch_size):
+        documents = split_raw_batch(batch)
+        target.insert_many(documents, ordered=False)
+        copied += len(documents)
+    return copied
+
+# ==========================================
+# 🔹 Benchmark: dict vs lazy vs raw batches
+# ==========================================
+def _measure(label, func):
+    cpu_start, start = time.process_time(), time.perf_counter()
+    count = func()
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    tracemalloc.start()  # Second run for memory: tracing distorts the timings
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"✅ {label:<22} {count:>9} docs  {elapsed:6.2f}s  cpu {cpu:6.2f}s  peak {peak / 2**20:7.1f} MB")
+
+
+def benchmark_scan(collection):
+    def scan_dicts():
+        return sum(1 for _ in collection.find(batch_size=1000))
+
+    def scan_lazy_forward():
+        # Only the raw bytes are used (forwarding / storing) → nothing is decoded
+        return sum(1 for document in iter_raw_documents(collection) if document.raw)
+
+    def scan_lazy_field():
+        # One key access decodes every top-level field → roughly the dict cost
+        return sum(1 for document in iter_raw_documents(collection) if document["name"])
+
+    def scan_raw_batches():
+        return sum(len(split_raw_batch(batch)) for batch in iter_raw_batches(collection))
+
+    _measure("find() → dict", scan_dicts)
+    _measure("RawBSONDocument .raw", scan_lazy_forward)
+    _measure("RawBSONDocument [key]", scan_lazy_field)
+    _measure("find_raw_batches()", scan_raw_batches)
+
+
+if __name__ == "__main__":
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert, generate_users
+
+    users = get_collection("users_raw")
+    users.drop()
+    bulk_insert(users, generate_users(int(os.environ.get("BENCH_DOCS", 1_000_000))), batch_size=5000)
+
+    print("\n📌 Full scan:")
+    benchmark_scan(users)
+
+    print("\n📌 Raw dump / copy:")
+    print(f"✅ Batches dumped: {dump_raw(users, 'users.bson')}")
+    copy_target = get_collection("users_raw_copy")
+    copy_target.drop()
+    print(f"✅ Documents copied: {copy_raw(users, copy_target)}")
+
+    os.remove("users.bson")
+    copy_target.drop()
+    users.drop()
@@ -0,0 +1,209 @@
+"""
+Users Replica Cache - In-process Copy Kept Fresh by a Change Stream
+"""
+
+import time
+import threading
+
+from pymongo.errors import PyMongoError, OperationFailure
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 How It Works
+# ==========================================
+"""
+- `start()` opens the change stream FIRST, then loads the whole collection once.
+  Events that happen during the load are replayed afterwards; applying them is
+  idempotent, so nothing is lost or duplicated.
+- A background thread tails the stream and updates two dicts:
+  `_id → document` and `username → document`.
+- `get(username)` is a dict lookup (microseconds) instead of a `find_one()`.
+- Each applied event stores its resume token. After a network error the stream is
+  reopened with `resume_after=token`.
+- If the token is too old (oplog rolled over), or the collection is dropped /
+  renamed, the cache does a full resync.
+- If that recovery fails too (server still down), it is retried with exponential
+  backoff up to `max_backoff` seconds until it succeeds or `stop()` is called.
+  Meanwhile lookups serve the last known data; `stats()` reports `healthy`,
+  `last_error` and whether the tailing thread is alive.
+- Change streams need a replica set (a single-node one is enough). For tests,
+  pass `open_stream` returning any object with `try_next()`, `resume_token` and
+  `close()`, or feed events directly to `apply_event()`.
+"""
+
+CHANGE_STREAM_HISTORY_LOST = 286
+RESYNC_EVENTS = ("drop", "dropDatabase", "rename", "invalidate")
+
+
+class UsersReplica:
+    def __init__(self, collection=None, key="username", open_stream=None, poll_interval=0.1, max_backoff=30.0):
+        self.collection = collection if collection is not None else get_collection("users")
+        self.key = key
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self._open_stream = open_stream or self._watch
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_key = {}
+        self._stream = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.resume_token = None
+        self.events_applied = 0
+        self.resyncs = 0
+        self.recovery_failures = 0
+        self.last_error = None
+        self.healthy = False
+        self.ready = threading.Event()
+
+    def _watch(self, resume_after):
+        return self.collection.watch(full_document="updateLookup", resume_after=resume_after)
+
+    # ==========================================
+    # 🔹 Lookups (served from memory)
+    # ==========================================
+    def get(self, value):
+        return self._by_key.get(value)
+
+    def get_by_id(self, _id):
+        return self._by_id.get(_id)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def stats(self):
+        return {
+            "documents": len(self._by_id),
+            "events_applied": self.events_applied,
+            "resyncs": self.resyncs,
+            "healthy": self.healthy,
+            "thread_alive": self._thread is not None and self._thread.is_alive(),
+            "recovery_failures": self.recovery_failures,
+            "last_error": repr(self.last_error) if self.last_error is not None else None,
+        }
+
+    # ==========================================
+    # 🔹 Full Load / Resync
+    # ==========================================
+    def resync(self):
+        self._close_stream()
+        self._stream = self._open_stream(None)  # Open before loading → no gap
+        by_id, by_key = {}, {}
+        for document in self.collection.find():
+            by_id[document["_id"]] = document
+            if document.get(self.key) is not None:
+                by_key[document[self.key]] = document
+        with self._lock:
+            self._by_id, self._by_key = by_id, by_key
+        self.resume_token = self._stream.resume_token
+        self.resyncs += 1
+        self.healthy = True
+        self.ready.set()
+
+    # ==========================================
+    # 🔹 Applying Change Events
+    # ==========================================
+    def apply_event(self, event):
+        operation = event["operationType"]
+        if operation in RESYNC_EVENTS:
+            return False  # Caller must resync
+        _id = event.get("documentKey", {}).get("_id")
+        with self._lock:
+            old = self._by_id.pop(_id, None)
+            if old is not None and self._by_key.get(old.get(self.key)) is old:
+                del self._by_key[old[self.key]]
+            document = event.get("fullDocument")
+            # fullDocument is None for deletes, and for updates of an already-deleted doc
+            if operation != "delete" and document is not None:
+                self._by_id[_id] = document
+                if document.get(self.key) is not None:
+                    self._by_key[document[self.key]] = document
+        self.resume_token = event.get("_id", self.resume_token)
+        self.events_applied += 1
+        return True
+
+    # ==========================================
+    # 🔹 Tailing Thread
+    # ==========================================
+    def start(self):
+        self.resync()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._close_stream()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                event = self._stream.try_next()
+                if event is None:
+                    self._stop.wait(self.poll_interval)
+                    continue
+                if not self.apply_event(event):
+                    self._recover(self.resync)
+            except OperationFailure as e:
+                self.last_error = e
+                self._recover(self.resync if e.code == CHANGE_STREAM_HISTORY_LOST else self._reopen)
+            except PyMongoError as e:
+                self.last_error = e
+                self._recover(self._reopen)
+
+    def _recover(self, action):
+        """Run `action` until it succeeds; back off while the server keeps failing."""
+        self.healthy = False
+        delay = self.poll_interval
+        while not self._stop.wait(delay):
+            try:
+                action()
+                self.healthy = True
+                return
+            except PyMongoError as e:
+                self.last_error = e
+                self.recovery_failures += 1
+                delay = min(self.max_backoff, delay * 2)
+
+    def _close_stream(self):
+        if self._stream is None:
+            return
+        try:
+            self._stream.close()
+        except PyMongoError:
+            pass
+
+    def _reopen(self):
+        self._close_stream()
+        try:
+            self._stream = self._open_stream(self.resume_token)
+        except OperationFailure as e:
+            if e.code != CHANGE_STREAM_HISTORY_LOST:
+                raise
+            self.resync()  # Token too old → a full reload is the only way back
+
+
+if __name__ == "__main__":
+    users = get_collection("users_replica")
+    users.drop()
+    users.insert_many([{"username": f"user_{i}", "city": "Chicago"} for i in range(10000)])
+
+    replica = UsersReplica(users).start()
+    print(f"\n📌 Replica loaded: {replica.stats()}")
+
+    users.update_one({"username": "user_42"}, {"$set": {"city": "Houston"}})
+    users.delete_one({"username": "user_7"})
+    time.sleep(1)
+    print(f"✅ user_42 city: {replica.get('user_42')['city']}")  # Houston
+    print(f"✅ user_7: {replica.get('user_7')}")                 # None
+
+    start = time.perf_counter()
+    for i in range(100_000):
+        replica.get(f"user_{i % 10000}")
+    print(f"✅ In-memory lookup: {1e6 * (time.perf_counter() - start) / 100_000:.2f} µs")
+
+    replica.stop()
+    users.drop()
@@ -0,0 +1,146 @@
+"""
+User Reports - Server-side Aggregation Pipelines with a TTL Result Cache
+"""
+
+import copy
+import time
+import hashlib
+
+from bson import json_util
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+from com.niteshsynergy.db.day22UserCache import TTLCache
+
+# ==========================================
+# 🔹 Why Aggregation Pipelines?
+# ==========================================
+"""
+- A client-side report pulls EVERY document with `find()` and loops in Python.
+- An aggregation pipeline runs on the server and returns only the summary rows
+  (a few per city / bucket) → tiny network transfer, no Python loop.
+- `$match` goes first and only uses indexed fields (city, age, balance, see
+  day22Indexes) so the server reads an index range, not the whole collection.
+- `allowDiskUse=True` lets large `$group` / `$sort` stages spill to disk instead of
+  failing at the 100MB memory limit.
+- Results are cached per (collection, pipeline) hash with a TTL, so a dashboard
+  refreshing every few seconds doesn't rescan the collection each time.
+  Key order is part of the hash: `{"$sort": {"a": 1, "b": -1}}` and
+  `{"$sort": {"b": -1, "a": 1}}` are different reports. Callers get their own copy
+  of a cached result, so mutating it cannot corrupt the cache.
+"""
+
+DEFAULT_AGE_BUCKETS = [0, 18, 25, 35, 50, 65, 150]
+
+_report_cache = TTLCache(maxsize=256, ttl=60.0)
+
+# ==========================================
+# 🔹 Running a Cached Pipeline
+# ==========================================
+def pipeline_key(collection, pipeline):
+    # Keys are NOT sorted: field order matters in $sort, $project and compound _id
+    text = json_util.dumps([collection.full_name, pipeline])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def run_report(pipeline, collection=None, use_cache=True, cache=None):
+    collection = collection if collection is not None else get_collection("users")
+    cache = cache if cache is not None else _report_cache  # An empty TTLCache is falsy
+    key = pipeline_key(collection, pipeline)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+    result = list(collection.aggregate(pipeline, allowDiskUse=True))
+    cache.set(key, copy.deepcopy(result))
+    return result
+
+
+def configure_report_cache(ttl=None, maxsize=None):
+    if ttl is not None:
+        _report_cache.ttl = ttl
+    if maxsize is not None:
+        _report_cache.maxsize = maxsize
+    _report_cache.clear()
+
+
+def report_cache_stats():
+    return _report_cache.stats()
+
+# ==========================================
+# 🔹 Report Pipelines
+# ==========================================
+def _match(city=None, min_age=None, max_age=None):
+    match = {}
+    if city is not None:
+        match["city"] = city
+    if min_age is not None or max_age is not None:
+        match["age"] = {}
+        if min_age is not None:
+            match["age"]["$gte"] = min_age
+        if max_age is not None:
+            match["age"]["$lt"] = max_age
+    return match
+
+
+def users_by_city(min_age=None, max_age=None, **options):
+    pipeline = [
+        {"$match": _match(min_age=min_age, max_age=max_age)},
+        {"$group": {"_id": "$city", "count": {"$sum": 1}, "avg_age": {"$avg": "$age"}}},
+        {"$sort": {"count": -1}},
+    ]
+    return run_report(pipeline, **options)
+
+
+def age_histogram(boundaries=None, city=None, **options):
+    boundaries = boundaries or DEFAULT_AGE_BUCKETS
+    pipeline = [
+        {"$match": _match(city=city, min_age=boundaries[0], max_age=boundaries[-1])},
+        {"$bucket": {"groupBy": "$age", "boundaries": boundaries, "default": "other",
+                     "output": {"count": {"$sum": 1}}}},
+    ]
+    return run_report(pipeline, **options)
+
+
+def top_by_balance(n=10, city=None, **options):
+    # Sort + limit right after $match → the server walks the balance index top-N
+    pipeline = [
+        {"$match": {**_match(city=city), "balance": {"$exists": True}}},
+        {"$sort": {"balance": -1}},
+        {"$limit": n},
+        {"$project": {"_id": 0, "name": 1, "username": 1, "city": 1, "balance": 1}},
+    ]
+    return run_report(pipeline, **options)
+
+
+def average_balance(city=None, **options):
+    pipeline = [
+        {"$match": {**_match(city=city), "balance": {"$exists": True}}},
+        {"$group": {"_id": None, "avg_balance": {"$avg": "$balance"}, "accounts": {"$sum": 1}}},
+    ]
+    result = run_report(pipeline, **options)
+    return result[0] if result else {"avg_balance": None, "accounts": 0}
+
+
+if __name__ == "__main__":
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert
+    from com.niteshsynergy.db.day22Indexes import ensure_indexes, INDEX_SPECS
+
+    users = get_collection("users_reports")
+    users.drop()
+    cities = ["New York", "Los Angeles", "Chicago", "Houston"]
+    bulk_insert(users, ({"name": f"user_{i}", "age": 16 + i % 70, "city": cities[i % 4], "balance": i % 5000}
+                        for i in range(200_000)))
+    ensure_indexes(users.database, {"users_reports": INDEX_SPECS["users"]})
+
+    print("\n📌 Reports:")
+    print("✅ By city:", users_by_city(collection=users))
+    print("✅ Age histogram:", age_histogram(collection=users))
+    print("✅ Top 3 by balance:", top_by_balance(3, collection=users))
+    print("✅ Average balance:", average_balance(collection=users))
+
+    start = time.perf_counter()
+    for _ in range(100):
+        users_by_city(collection=users)
+    print(f"✅ 100 cached dashboard refreshes: {1000 * (time.perf_counter() - start):.1f} ms, {report_cache_stats()}")
+
+    users.drop()
@@ -0,0 +1,285 @@
+"""
+Pluggable User Storage - MongoDB and Embedded SQLite Backends for day22
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from com.niteshsynergy.db.day22ClientPool import get_client, get_collection, DEFAULT_DB
+from com.niteshsynergy.db.day22Hashing import hash_password, check_password
+
+# ==========================================
+# 🔹 One Interface, Two Backends
+# ==========================================
+"""
+- `UserStore` is the interface for every day22 operation: insert, find, update,
+  delete, transaction and register / login.
+- `MongoUserStore` → a live MongoDB (shared pooled client).
+- `SQLiteUserStore` → an embedded database file, nothing to install or start:
+  - WAL journal mode: readers never block the writer.
+  - Parameterised statements, reused through sqlite3's statement cache.
+  - `executemany()` for batch inserts inside one transaction.
+  - Indexes on username (unique), name and (city, age), like day22Indexes.
+- Filters are equality matches `{"field": value}`; updates support `$set` / `$inc`.
+- `run_workload(store)` runs the same workload on either backend for comparison.
+"""
+
+# ==========================================
+# 🔹 Storage Interface
+# ==========================================
+class UserStore(ABC):
+    @abstractmethod
+    def insert_user(self, document): ...
+
+    @abstractmethod
+    def insert_users(self, documents): ...
+
+    @abstractmethod
+    def find_user(self, query): ...
+
+    @abstractmethod
+    def find_users(self, query=None): ...
+
+    @abstractmethod
+    def update_user(self, query, update): ...
+
+    @abstractmethod
+    def delete_user(self, query): ...
+
+    @abstractmethod
+    def transaction(self):
+        """Context manager: everything inside commits or rolls back together."""
+
+    @abstractmethod
+    def drop(self): ...
+
+    def register_user(self, username, password):
+        self.insert_user({"username": username, "password": hash_password(password)})
+
+    def login_user(self, username, password):
+        user = self.find_user({"username": username})
+        return bool(user) and check_password(password, user["password"])
+
+# ==========================================
+# 🔹 MongoDB Backend
+# ==========================================
+class MongoUserStore(UserStore):
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else get_collection("users")
+        self._session = threading.local()
+
+    @property
+    def session(self):
+        return getattr(self._session, "current", None)
+
+    def insert_user(self, document):
+        return self.collection.insert_one(dict(document), session=self.session).inserted_id
+
+    def insert_users(self, documents):
+        documents = [dict(document) for document in documents]
+        return len(self.collection.insert_many(documents, ordered=False, session=self.session).inserted_ids)
+
+    def find_user(self, query):
+        return self.collection.find_one(query, session=self.session)
+
+    def find_users(self, query=None):
+        return self.collection.find(query or {}, session=self.session)
+
+    def update_user(self, query, update):
+        return self.collection.update_one(query, update, session=self.session).modified_count
+
+    def delete_user(self, query):
+        return self.collection.delete_one(query, session=self.session).deleted_count
+
+    @contextmanager
+    def transaction(self):
+        # The session must come from the client that owns this store's collection
+        with self.collection.database.client.start_session() as session:
+            with session.start_transaction():
+                self._session.current = session
+                try:
+                    yield self
+                finally:
+                    self._session.current = None
+
+    def drop(self):
+        self.collection.drop()
+
+# ==========================================
+# 🔹 SQLite Backend
+# ==========================================
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    _id      INTEGER PRIMARY KEY,
+    username TEXT,
+    password BLOB,
+    name     TEXT,
+    age      INTEGER,
+    city     TEXT,
+    balance  INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS username_unique ON users(username) WHERE username IS NOT NULL;
+CREATE INDEX IF NOT EXISTS name ON users(name);
+CREATE INDEX IF NOT EXISTS city_age ON users(city, age);
+"""
+
+SQLITE_COLUMNS = ("_id", "username", "password", "name", "age", "city", "balance")
+INSERT_SQL = "INSERT INTO users (username, password, name, age, city, balance) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+class SQLiteUserStore(UserStore):
+    def __init__(self, path="users.db"):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(SQLITE_SCHEMA)
+
+    # One connection per thread; WAL lets them read while another writes
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, cached_statements=256,
+                                         check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    @staticmethod
+    def _check_fields(fields):
+        unknown = [field for field in fields if field not in SQLITE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown user fields: {unknown}")
+
+    def _where(self, query):
+        query = query or {}
+        self._check_fields(query)
+        if not query:
+            return "", []
+        return " WHERE " + " AND ".join(f"{field} = ?" for field in query), list(query.values())
+
+    @staticmethod
+    def _row(document):
+        return (document.get("username"), document.get("password"), document.get("name"),
+                document.get("age"), document.get("city"), document.get("balance"))
+
+    @staticmethod
+    def _document(row):
+        return {key: row[key] for key in row.keys() if row[key] is not None}
+
+    def insert_user(self, document):
+        self._check_fields(document)
+        return self._connection().execute(INSERT_SQL, self._row(document)).lastrowid
+
+    def insert_users(self, documents):
+        rows = []
+        for document in documents:
+            self._check_fields(document)
+            rows.append(self._row(document))
+        with self.transaction():
+            self._connection().executemany(INSERT_SQL, rows)
+        return len(rows)
+
+    def find_user(self, query):
+        where, params = self._where(query)
+        row = self._connection().execute(f"SELECT * FROM users{where} LIMIT 1", params).fetchone()
+        return self._document(row) if row else None
+
+    def find_users(self, query=None):
+        where, params = self._where(query)
+        for row in self._connection().execute(f"SELECT * FROM users{where}", params):
+            yield self._document(row)
+
+    def update_user(self, query, update):
+        unsupported = set(update) - {"$set", "$inc"}
+        if unsupported:
+            raise ValueError(f"Unsupported update operators: {sorted(unsupported)}")
+        self._check_fields(list(update.get("$set", {})) + list(update.get("$inc", {})))
+        sets, params = [], []
+        for field, value in update.get("$set", {}).items():
+            sets.append(f"{field} = ?")
+            params.append(value)
+        for field, value in update.get("$inc", {}).items():
+            sets.append(f"{field} = COALESCE({field}, 0) + ?")
+            params.append(value)
+        if not sets:
+            return 0
+        where, where_params = self._where(query)
+        # update_one semantics: only the first matching row
+        sql = f"UPDATE users SET {', '.join(sets)} WHERE _id = (SELECT _id FROM users{where} LIMIT 1)"
+        return self._connection().execute(sql, params + where_params).rowcount
+
+    def delete_user(self, query):
+        where, params = self._where(query)
+        sql = f"DELETE FROM users WHERE _id = (SELECT _id FROM users{where} LIMIT 1)"
+        return self._connection().execute(sql, params).rowcount
+
+    @contextmanager
+    def transaction(self):
+        connection = self._connection()
+        if self._local.depth:  # Already inside a transaction → join it
+            self._local.depth += 1
+            try:
+                yield self
+            finally:
+                self._local.depth -= 1
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield self
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def drop(self):
+        self._connection().execute("DELETE FROM users")
+
+# ==========================================
+# 🔹 Shared Workload / Backend Comparison
+# ==========================================
+def run_workload(store, count=20000):
+    cities = ["New York", "Los Angeles", "Chicago"]
+    store.drop()
+    results = {}
+
+    def timed(label, operations, func):
+        start = time.perf_counter()
+        func()
+        results[label] = round(operations / (time.perf_counter() - start))
+
+    timed("insert_users", count, lambda: store.insert_users(
+        {"name": f"user_{i}", "age": 18 + i % 60, "city": cities[i % 3], "balance": 500} for i in range(count)))
+    lookups = count // 10
+    timed("find_user", lookups, lambda: [store.find_user({"name": f"user_{i}"}) for i in range(lookups)])
+    timed("update_user", lookups, lambda: [store.update_user({"name": f"user_{i}"}, {"$inc": {"balance": -200}})
+                                           for i in range(lookups)])
+    timed("delete_user", lookups, lambda: [store.delete_user({"name": f"user_{i}"}) for i in range(lookups)])
+
+    def transfers():
+        for i in range(lookups, 2 * lookups):
+            with store.transaction():
+                store.update_user({"name": f"user_{i}"}, {"$inc": {"balance": -200}})
+                store.update_user({"name": f"user_{i + 1}"}, {"$inc": {"balance": 200}})
+    timed("transaction", lookups, transfers)
+
+    store.drop()
+    return results
+
+
+if __name__ == "__main__":
+    print("\n📌 Backend comparison (ops/sec):")
+    sqlite_path = "users_bench.db"
+    print("✅ SQLite :", run_workload(SQLiteUserStore(sqlite_path)))
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(sqlite_path + suffix):
+            os.remove(sqlite_path + suffix)
+    print("✅ MongoDB:", run_workload(MongoUserStore(get_client()[DEFAULT_DB]["users_storage"])))
@@ -0,0 +1,156 @@
+"""
+MongoDB Batched Transactions - Many Operations per Transaction, with Retry
+"""
+
+import time
+import random
+import itertools
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why Batch Transactions?
+# ==========================================
+"""
+- day22 opens one transaction for one insert + one update. Every transaction has a
+  fixed cost (start, commit, majority write), so one-per-operation is slow.
+- `run_batched_transactions()` groups logical operations into transactions of at
+  most `batch_size` operations. Consecutive write models (UpdateOne, InsertOne, ...)
+  go to the server as ONE `bulk_write` inside the transaction; a callable in
+  between splits the run, so operations always apply in the order given.
+- Error labels decide the retry:
+  - `TransientTransactionError` → abort and re-run the whole batch.
+  - `UnknownTransactionCommitResult` → only the commit is retried (it is idempotent).
+- Retries back off exponentially with jitter, so conflicting writers spread out.
+- Keep batches well under the 60s transaction lifetime and 16MB oplog entry limit.
+"""
+
+# ==========================================
+# 🔹 Transaction Statistics
+# ==========================================
+class TransactionStats:
+    def __init__(self):
+        self.commits = 0
+        self.aborts = 0
+        self.retries = 0
+        self.operations = 0
+        self.commit_latencies = []
+
+    @property
+    def abort_rate(self):
+        attempts = self.commits + self.aborts
+        return self.aborts / attempts if attempts else 0.0
+
+    def summary(self):
+        latencies = sorted(self.commit_latencies) or [0.0]
+        return {
+            "operations": self.operations,
+            "commits": self.commits,
+            "aborts": self.aborts,
+            "retries": self.retries,
+            "abort_rate": round(self.abort_rate, 4),
+            "commit_ms_avg": round(1000 * sum(latencies) / len(latencies), 2),
+            "commit_ms_p95": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+        }
+
+# ==========================================
+# 🔹 Running One Batch with Retry
+# ==========================================
+def _backoff(attempt, base_delay, max_delay):
+    time.sleep(min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+def _apply(batch, collection, session):
+    models = []
+    for op in batch:
+        if not callable(op):
+            models.append(op)
+            continue
+        if models:  # Flush the run of models queued before this callable
+            collection.bulk_write(models, ordered=True, session=session)
+            models = []
+        op(session)
+    if models:
+        collection.bulk_write(models, ordered=True, session=session)
+
+
+def _commit_with_retry(session, stats, max_retries, base_delay, max_delay):
+    for attempt in itertools.count():
+        start = time.perf_counter()
+        try:
+            session.commit_transaction()
+            stats.commit_latencies.append(time.perf_counter() - start)
+            return
+        except PyMongoError as e:
+            if e.has_error_label("UnknownTransactionCommitResult") and attempt < max_retries:
+                stats.retries += 1
+                _backoff(attempt, base_delay, max_delay)
+                continue
+            raise
+
+
+def run_transaction(batch, collection, session, stats, max_retries=5, base_delay=0.05, max_delay=2.0):
+    for attempt in itertools.count():
+        try:
+            session.start_transaction()
+            _apply(batch, collection, session)
+            _commit_with_retry(session, stats, max_retries, base_delay, max_delay)
+            stats.commits += 1
+            stats.operations += len(batch)
+            return
+        except PyMongoError as e:
+            if session.in_transaction:
+                try:
+                    session.abort_transaction()
+                except PyMongoError:
+                    pass  # Commit was already attempted; nothing left to abort
+            stats.aborts += 1
+            if e.has_error_label("TransientTransactionError") and attempt < max_retries:
+                stats.retries += 1
+                _backoff(attempt, base_delay, max_delay)
+                continue
+            raise
+
+# ==========================================
+# 🔹 Batched Transactions
+# ==========================================
+def run_batched_transactions(operations, collection=None, batch_size=500, client=None, **retry_options):
+    """Apply `operations` (write models, or callables taking the session) in
+    transactions of up to `batch_size` operations. Returns `TransactionStats`."""
+    collection = collection if collection is not None else get_collection("users")
+    # The session must come from the client that owns the collection
+    client = client or collection.database.client
+    stats = TransactionStats()
+    iterator = iter(operations)
+    with client.start_session() as session:
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                break
+            run_transaction(batch, collection, session, stats, **retry_options)
+    return stats
+
+
+def balance_adjustments(count, accounts):
+    # High-volume version of the day22 "David" $inc example
+    for i in range(count):
+        yield UpdateOne({"name": f"acct_{i % accounts}"}, {"$inc": {"balance": random.choice((-20, 50))}})
+
+
+if __name__ == "__main__":
+    accounts = get_collection("users_transactions")
+    accounts.drop()
+    accounts.insert_many([{"name": f"acct_{i}", "balance": 500} for i in range(1000)])
+
+    print("\n📌 Batched transactions (needs a replica set):")
+    for batch_size in (1, 100, 1000):
+        count = 2000 if batch_size == 1 else 50_000
+        start = time.perf_counter()
+        stats = run_batched_transactions(balance_adjustments(count, 1000), accounts, batch_size=batch_size)
+        rate = count / (time.perf_counter() - start)
+        print(f"✅ batch_size={batch_size}: {rate:.0f} ops/sec, {stats.summary()}")
+
+    accounts.drop()
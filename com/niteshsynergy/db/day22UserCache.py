@@ -0,0 +1,169 @@
+"""
+User Cache - Read-through LRU + TTL Cache in Front of find_one
+"""
+
+import copy
+import time
+import threading
+from collections import OrderedDict
+
+from pymongo import ReturnDocument
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 How the Cache Works
+# ==========================================
+"""
+- Read-through: `find_user(username)` serves from memory on a hit, otherwise it
+  calls `find_one()` and stores the result.
+- Bounded: at most `maxsize` users (LRU eviction) and each entry expires after
+  `ttl` seconds, so data edited outside this module is never stale for long.
+- Writes made through `update_user()` / `delete_user()` invalidate the entry.
+  They use `find_one_and_update` / `find_one_and_delete`, so even filters that are
+  not by username invalidate the right user.
+- A read that raced with a write is not cached (generation check), so an old
+  document can never be stored after its invalidation.
+- The cache stores its own copy and every hit returns a fresh copy, so a caller
+  that mutates a returned user cannot change what later hits see.
+- `use_cache=False` bypasses the cache for a single call.
+"""
+
+# ==========================================
+# 🔹 LRU + TTL Cache
+# ==========================================
+class TTLCache:
+    def __init__(self, maxsize=10000, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+# ==========================================
+# 🔹 Cached User Repository
+# ==========================================
+_MISSING = object()
+
+
+class CachedUsers:
+    def __init__(self, collection=None, maxsize=10000, ttl=60.0):
+        self.collection = collection if collection is not None else get_collection("users")
+        self.cache = TTLCache(maxsize, ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _invalidate(self, *usernames):
+        # Bump + pop under the same lock as find_user's check + set
+        with self._lock:
+            self._generation += 1
+            for username in usernames:
+                if username is not None:
+                    self.cache.pop(username)
+
+    def find_user(self, username, use_cache=True):
+        if not use_cache:
+            return self.collection.find_one({"username": username})
+        user = self.cache.get(username, _MISSING)
+        if user is not _MISSING:
+            return copy.deepcopy(user)
+        generation = self._generation
+        user = self.collection.find_one({"username": username})
+        if user is not None:
+            with self._lock:  # Check + set are atomic against _invalidate
+                if generation == self._generation:
+                    self.cache.set(username, copy.deepcopy(user))
+        return user
+
+    def update_user(self, query, update):
+        if isinstance(query, str):
+            query = {"username": query}
+        before = self.collection.find_one_and_update(
+            query, update, projection={"username": 1}, return_document=ReturnDocument.BEFORE)
+        if before is None:
+            return False
+        # A renamed user must not stay cached under the new name either
+        renamed_to = update.get("$set", {}).get("username") if isinstance(update, dict) else None
+        self._invalidate(before.get("username"), renamed_to)
+        return True
+
+    def delete_user(self, query):
+        if isinstance(query, str):
+            query = {"username": query}
+        deleted = self.collection.find_one_and_delete(query, projection={"username": 1})
+        if deleted is None:
+            return False
+        self._invalidate(deleted.get("username"))
+        return True
+
+    def stats(self):
+        return self.cache.stats()
+
+
+if __name__ == "__main__":
+    users = get_collection("users_cache")
+    users.drop()
+    users.insert_one({"username": "john_doe", "city": "New York"})
+
+    cached = CachedUsers(users, maxsize=1000, ttl=30)
+    print("\n📌 Read-through cache:")
+    for _ in range(1000):
+        cached.find_user("john_doe")
+    print(f"✅ After 1000 reads: {cached.stats()}")
+
+    cached.update_user("john_doe", {"$set": {"city": "Chicago"}})
+    print(f"✅ After update: {cached.find_user('john_doe')['city']}")  # Chicago, not stale
+    cached.delete_user("john_doe")
+    print(f"✅ After delete: {cached.find_user('john_doe')}")  # None
+
+    users.drop()
@@ -0,0 +1,118 @@
+"""
+Process-pool User Workloads - One MongoClient per Worker, _id-Range Splits
+"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from com.niteshsynergy.db.day22ClientPool import get_collection, DEFAULT_DB
+
+# ==========================================
+# 🔹 Why a Worker Initializer?
+# ==========================================
+"""
+- A MongoClient is NOT fork-safe: its sockets and background threads are copied
+  into the child, and two processes end up talking on the same connection.
+- day22ClientPool forgets inherited clients after `fork()`, and
+  `init_worker()` (the ProcessPoolExecutor `initializer`) opens ONE fresh client
+  per worker process, reused by every task that worker runs.
+- Work is split by `_id` range with `$bucketAuto` on the server, so each task
+  is an indexed range scan, never skip/limit.
+- Tasks return small summaries (counts, sums) instead of documents → nothing big
+  is pickled back to the parent.
+- Same pattern as the ProcessPoolExecutor section in day19, plus a database.
+"""
+
+_worker_collection = None
+
+# ==========================================
+# 🔹 Worker Process Setup
+# ==========================================
+def init_worker(collection_name="users", db_name=DEFAULT_DB, uri=None):
+    global _worker_collection
+    _worker_collection = get_collection(collection_name, db_name, uri)
+
+# ==========================================
+# 🔹 Splitting the Collection into _id Ranges
+# ==========================================
+def split_id_ranges(collection, parts):
+    """Return `[(lower, upper), ...]` covering the collection; `upper` is
+    exclusive and `None` for the last range."""
+    buckets = list(collection.aggregate(
+        [{"$bucketAuto": {"groupBy": "$_id", "buckets": parts}}], allowDiskUse=True))
+    lowers = [bucket["_id"]["min"] for bucket in buckets]
+    return list(zip(lowers, lowers[1:] + [None]))
+
+
+def _range_filter(lower, upper):
+    bounds = {"$gte": lower}
+    if upper is not None:
+        bounds["$lt"] = upper
+    return {"_id": bounds}
+
+# ==========================================
+# 🔹 Tasks (run inside workers, return summaries)
+# ==========================================
+def city_age_summary(documents):
+    cities, total_age, count = Counter(), 0, 0
+    for document in documents:
+        cities[document.get("city")] += 1
+        total_age += document.get("age") or 0
+        count += 1
+    return {"count": count, "total_age": total_age, "cities": cities}
+
+
+def merge_summaries(summaries):
+    merged = {"count": 0, "total_age": 0, "cities": Counter()}
+    for summary in summaries:
+        merged["count"] += summary["count"]
+        merged["total_age"] += summary["total_age"]
+        merged["cities"].update(summary["cities"])
+    return merged
+
+
+def run_range(id_range, task=city_age_summary, projection=None, batch_size=2000):
+    cursor = _worker_collection.find(_range_filter(*id_range), projection, batch_size=batch_size)
+    return task(cursor)
+
+# ==========================================
+# 🔹 Fan-out / Gather
+# ==========================================
+def run_parallel(collection_name="users", workers=None, task=city_age_summary, merge=merge_summaries,
+                 projection=None, ranges_per_worker=4, mp_context=None):
+    workers = workers or os.cpu_count()
+    ranges = split_id_ranges(get_collection(collection_name), workers * ranges_per_worker)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=init_worker, initargs=(collection_name,)) as executor:
+        futures = [executor.submit(run_range, id_range, task, projection) for id_range in ranges]
+        return merge(future.result() for future in futures)
+
+# ==========================================
+# 🔹 Scaling Benchmark (1 → N cores)
+# ==========================================
+def scaling_benchmark(collection_name, max_workers=None):
+    max_workers = max_workers or os.cpu_count()
+    baseline = None
+    worker_counts = sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+    for workers in worker_counts:
+        start = time.perf_counter()
+        summary = run_parallel(collection_name, workers, projection={"city": 1, "age": 1})
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"✅ workers={workers}: {summary['count']} docs in {elapsed:.2f}s "
+              f"({summary['count'] / elapsed:.0f} docs/sec, speed-up x{baseline / elapsed:.2f})")
+
+
+if __name__ == "__main__":
+    from com.niteshsynergy.db.day22BulkIngest import bulk_insert, generate_users
+
+    users = get_collection("users_workers")
+    users.drop()
+    bulk_insert(users, generate_users(int(os.environ.get("BENCH_DOCS", 1_000_000))), batch_size=5000)
+
+    print("\n📌 Process-pool scaling:")
+    scaling_benchmark("users_workers")
+
+    users.drop()
@@ -0,0 +1,202 @@
+"""
+MongoDB Write Batcher - Coalescing Writes into bulk_write(ordered=False)
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import Future
+
+from pymongo import InsertOne, UpdateOne, DeleteOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from com.niteshsynergy.db.day22ClientPool import get_collection
+
+# ==========================================
+# 🔹 Why Batch Writes?
+# ==========================================
+"""
+- Each `update_one()` / `delete_one()` is one network round trip.
+- `WriteBatcher` collects InsertOne / UpdateOne / DeleteOne / ReplaceOne from any
+  number of caller threads and sends them as ONE `bulk_write(ordered=False)` when
+  `max_ops` are queued or the oldest op has waited `max_delay` seconds.
+- Every caller gets a Future: it resolves to that operation's result, or raises
+  the server's write error for that operation only (unordered → the rest of the
+  batch is still applied).
+- Unordered batches give no ordering guarantee between ops in the same batch:
+  do not queue two writes to the same document if their order matters.
+- A Future cancelled while still queued is dropped from its batch (never sent).
+- Backpressure: once `max_pending` operations are queued, `submit()` blocks until
+  the flusher has sent a batch, so memory stays bounded.
+"""
+
+# ==========================================
+# 🔹 Per-operation Result
+# ==========================================
+class WriteOpError(Exception):
+    def __init__(self, error):
+        super().__init__(error.get("errmsg", "write failed"))
+        self.code = error.get("code")
+        self.details = error
+
+# ==========================================
+# 🔹 Write Batcher
+# ==========================================
+class WriteBatcher:
+    def __init__(self, collection=None, max_ops=1000, max_delay=0.05, max_pending=None):
+        self.collection = collection if collection is not None else get_collection("users")
+        self.max_ops = max_ops
+        self.max_pending = max_pending or 10 * max_ops
+        self.max_delay = max_delay
+        self._pending = []  # (operation, future)
+        self._oldest = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self.round_trips = 0
+        self.operations = 0
+        self.flush_latencies = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # --- Caller API ---
+    def submit(self, operation):
+        future = Future()
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WriteBatcher is closed")
+                if len(self._pending) < self.max_pending:
+                    break
+                self._condition.notify_all()  # Make sure the flusher is awake
+                self._condition.wait()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((operation, future))
+            # Wake the flusher to start the max_delay timer, or to send a full batch
+            if len(self._pending) == 1 or len(self._pending) >= self.max_ops:
+                self._condition.notify_all()
+        return future
+
+    def insert_one(self, document):
+        return self.submit(InsertOne(document))
+
+    def update_one(self, query, update, upsert=False):
+        return self.submit(UpdateOne(query, update, upsert=upsert))
+
+    def replace_one(self, query, replacement, upsert=False):
+        return self.submit(ReplaceOne(query, replacement, upsert=upsert))
+
+    def delete_one(self, query):
+        return self.submit(DeleteOne(query))
+
+    def flush(self):
+        with self._condition:
+            batch, self._pending = self._pending, []
+            self._condition.notify_all()  # Wake submitters blocked on max_pending
+        self._send(batch)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Background flusher ---
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if len(self._pending) >= self.max_ops:
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                batch, self._pending = self._pending[:self.max_ops], self._pending[self.max_ops:]
+                self._oldest = time.monotonic() if self._pending else None
+                self._condition.notify_all()  # Wake submitters blocked on max_pending
+            self._send(batch)
+
+    def _send(self, batch):
+        # Cancelled futures are dropped; the rest can no longer be cancelled
+        batch = [(operation, future) for operation, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        operations = [operation for operation, _ in batch]
+        start = time.perf_counter()
+        errors, upserted = {}, {}
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids or {}
+        except BulkWriteError as e:
+            errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+            upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+        except Exception as e:  # Network / server failure: the whole batch failed
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self.round_trips += 1
+            self.operations += len(batch)
+            self.flush_latencies.append(time.perf_counter() - start)
+
+        for index, (operation, future) in enumerate(batch):
+            if index in errors:
+                future.set_exception(WriteOpError(errors[index]))
+            else:
+                future.set_result({"ok": True, "upserted_id": upserted.get(index)})
+
+    def stats(self):
+        latencies = self.flush_latencies or [0.0]
+        return {
+            "operations": self.operations,
+            "round_trips": self.round_trips,
+            "ops_per_round_trip": round(self.operations / max(self.round_trips, 1), 1),
+            "flush_ms_avg": round(1000 * sum(latencies) / len(latencies), 2),
+        }
+
+# ==========================================
+# 🔹 Benchmark: 100k $set / $inc Changes
+# ==========================================
+def benchmark(collection, changes=100_000, accounts=1000):
+    collection.drop()
+    collection.insert_many([{"name": f"acct_{i}", "balance": 0, "touched": 0} for i in range(accounts)])
+
+    def change(i):
+        if i % 2:
+            return {"name": f"acct_{i % accounts}"}, {"$inc": {"balance": 1}}
+        return {"name": f"acct_{i % accounts}"}, {"$set": {"touched": i}}
+
+    sample = changes // 10
+    start = time.perf_counter()
+    for i in range(sample):
+        collection.update_one(*change(i))
+    single_rate = sample / (time.perf_counter() - start)
+    print(f"✅ update_one: {sample} ops, {sample} round trips, {single_rate:.0f} ops/sec")
+
+    start = time.perf_counter()
+    with WriteBatcher(collection, max_ops=1000) as batcher:
+        futures = [batcher.update_one(*change(i)) for i in range(changes)]
+    for future in futures:
+        future.result()
+    batched_rate = changes / (time.perf_counter() - start)
+    print(f"✅ WriteBatcher: {batcher.stats()}, {batched_rate:.0f} ops/sec")
+    print(f"✅ Round trips saved: {changes - batcher.round_trips}")
+    collection.drop()
+
+
+if __name__ == "__main__":
+    print("\n📌 Write batching benchmark:")
+    benchmark(get_collection("users_write_batch"), changes=int(os.environ.get("BENCH_OPS", 100_000)))
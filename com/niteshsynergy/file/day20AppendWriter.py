@@ -0,0 +1,257 @@
+"""
+Group-commit Append Writer - Buffered, Thread-safe, Configurable fsync
+"""
+
+import os
+import time
+import threading
+
+# ------------------------------------------------
+# 1. Why Not `open("output.txt", "a")` per Line?
+# ------------------------------------------------
+"""
+- Every `with open(path, "a")` is an open + a small write + a close: three system
+  calls (plus a metadata update) for one line.
+- `AppendWriter` keeps the file open. Any number of threads call `write()`, which
+  only appends to an in-memory list. A background thread writes the buffer with
+  ONE `write()` when `max_bytes` are pending or the oldest data has waited
+  `max_delay` seconds.
+- Lines from one `write()` call are never split or interleaved with other threads.
+- Durability knob: `fsync_interval`
+    None → never fsync: a flushed batch survives a crash of THIS process, but
+           the last seconds may be lost on power failure / kernel crash
+    0    → fsync after every batch (group commit): once a batch is written it is
+           on disk; many lines share one fsync
+    N    → fsync at most every N seconds: at most N seconds (+ max_delay) of
+           data lost on power failure
+  In every mode, data still in the memory buffer (≤ max_delay old) is lost if
+  the process crashes. Call `flush(fsync=True)` when a record must be durable now.
+- Write errors (disk full, ...) are never swallowed: the unwritten bytes stay
+  buffered, and the error is raised by the next `write()`, `flush()` or `close()`.
+  Background flushing pauses until a `flush()` succeeds again.
+- Backpressure: once `max_pending_bytes` are buffered, `write()` blocks until the
+  flusher has caught up, so a slow disk cannot make memory grow without limit.
+"""
+
+# ------------------------------------------------
+# 2. Append Writer
+# ------------------------------------------------
+class AppendWriter:
+    def __init__(self, path, max_bytes=1 << 20, max_delay=0.05, fsync_interval=None, encoding="utf-8",
+                 max_pending_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_pending_bytes = max_pending_bytes or 8 * max_bytes
+        self.max_delay = max_delay
+        self.fsync_interval = fsync_interval
+        self.encoding = encoding
+        self._file = open(path, "ab", buffering=0)  # Raw: every write() reports bytes written
+        self._pending = []
+        self._pending_bytes = 0
+        self._oldest = None
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()  # Keeps batches in order between flusher and flush()
+        self._last_fsync = time.monotonic()
+        self._unsynced = False  # Written to the OS but not fsync-ed yet
+        self._closed = False
+        self._error = None  # First write / fsync error, until a flush() succeeds
+        self._started = time.perf_counter()
+        self.records = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self.flush_latencies = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # --- Caller API ---
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("AppendWriter is closed")
+                if self._error is not None:
+                    raise self._error
+                if self._pending_bytes < self.max_pending_bytes:
+                    break
+                self._condition.notify_all()  # Make sure the flusher is awake
+                self._condition.wait()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            # Wake the flusher to start the max_delay timer, or to write a full buffer
+            if len(self._pending) == 1 or self._pending_bytes >= self.max_bytes:
+                self._condition.notify_all()
+
+    def write_line(self, line):
+        self.write(line + "\n")
+
+    def flush(self, fsync=None):
+        """Write everything buffered; fsync if asked or if the interval says so."""
+        self._flush(force_fsync=bool(fsync), retry=True)
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        try:
+            self._flush(force_fsync=self.fsync_interval is not None, retry=True)
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Background flusher ---
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._error is not None:  # Paused until flush() succeeds
+                        self._condition.wait()
+                        continue
+                    if self._pending_bytes >= self.max_bytes:
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                    elif self._unsynced and self.fsync_interval is not None:
+                        # Writes stopped: still fsync within the promised interval
+                        remaining = self._last_fsync + self.fsync_interval - time.monotonic()
+                    else:
+                        self._condition.wait()
+                        continue
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self._flush()
+            except OSError:
+                pass  # Saved in self._error; callers see it on their next call
+
+    def _take_pending(self):
+        with self._condition:
+            batch, self._pending = self._pending, []
+            self._pending_bytes = 0
+            self._oldest = None
+            self._condition.notify_all()  # Wake writers blocked on max_pending_bytes
+        return batch
+
+    def _requeue(self, data):
+        # Unwritten bytes go back in FRONT, so order is kept for the retry
+        with self._condition:
+            self._pending.insert(0, data)
+            self._pending_bytes += len(data)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _fail(self, error):
+        with self._condition:
+            if self._error is None:
+                self._error = error
+            self._condition.notify_all()  # Blocked writers must see the error
+        raise self._error
+
+    def _fsync_due(self):
+        if self.fsync_interval is None:
+            return False
+        return time.monotonic() - self._last_fsync >= self.fsync_interval
+
+    def _flush(self, force_fsync=False, retry=False):
+        with self._io_lock:
+            if self._error is not None:
+                if not retry:
+                    raise self._error
+                with self._condition:
+                    self._error = None  # Caller asked to try again
+            batch = self._take_pending()
+            start = time.perf_counter()
+            if batch:
+                data = memoryview(b"".join(batch))
+                written = 0
+                try:
+                    while written < len(data):
+                        written += self._file.write(data[written:])
+                except OSError as e:
+                    self._requeue(bytes(data[written:]))
+                    self._unsynced = self._unsynced or written > 0
+                    self._fail(e)
+                self.records += len(batch)
+                self.bytes_written += len(data)
+                self.flushes += 1
+                self._unsynced = True
+            if self._unsynced and (force_fsync or self._fsync_due()):
+                try:
+                    os.fsync(self._file.fileno())
+                except OSError as e:
+                    self._fail(e)
+                self._last_fsync = time.monotonic()
+                self._unsynced = False
+                self.fsyncs += 1
+            if batch:
+                self.flush_latencies.append(time.perf_counter() - start)
+
+    # --- Reporting ---
+    def stats(self):
+        latencies = sorted(self.flush_latencies) or [0.0]
+        elapsed = time.perf_counter() - self._started
+        return {
+            "records": self.records,
+            "bytes": self.bytes_written,
+            "flushes": self.flushes,
+            "fsyncs": self.fsyncs,
+            "records_per_flush": round(self.records / max(self.flushes, 1), 1),
+            "records_per_sec": round(self.records / elapsed),
+            "mb_per_sec": round(self.bytes_written / elapsed / 2 ** 20, 2),
+            "flush_ms_avg": round(1000 * sum(latencies) / len(latencies), 3),
+            "flush_ms_p99": round(1000 * latencies[int(0.99 * (len(latencies) - 1))], 3),
+        }
+
+# ------------------------------------------------
+# 3. Benchmark vs Reopening the File per Line
+# ------------------------------------------------
+def _append_with_reopen(path, lines):
+    for line in lines:
+        with open(path, "a") as file:
+            file.write(line)
+
+
+def _append_with_writer(path, lines, threads, **options):
+    writer = AppendWriter(path, **options)
+    share = len(lines) // threads
+    workers = [threading.Thread(target=lambda part: [writer.write(line) for line in part],
+                                args=(lines[i * share:(i + 1) * share],)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    writer.close()
+    return writer
+
+
+if __name__ == "__main__":
+    demo_file = "events.log"
+    lines = [f"{time.time():.6f} event={i} user=user_{i % 1000} status=ok\n" for i in range(200_000)]
+
+    start = time.perf_counter()
+    _append_with_reopen(demo_file, lines[:20_000])
+    rate = 20_000 / (time.perf_counter() - start)
+    print(f"open('a') per line              : {rate:>10,.0f} lines/sec")
+    os.remove(demo_file)
+
+    for label, fsync_interval in (("no fsync", None), ("fsync every 1s", 1.0), ("fsync every batch", 0)):
+        start = time.perf_counter()
+        writer = _append_with_writer(demo_file, lines, threads=4, fsync_interval=fsync_interval)
+        rate = len(lines) / (time.perf_counter() - start)
+        print(f"AppendWriter, {label:<17}: {rate:>10,.0f} lines/sec  {writer.stats()}")
+        os.remove(demo_file)
@@ -0,0 +1,358 @@
+"""
+Columnar CSV Cache - Binary Columns, Dictionary-encoded Strings & mmap Loading
+"""
+
+import os
+import csv
+import sys
+import json
+import mmap
+import math
+import time
+import struct
+from array import array
+
+# ------------------------------------------------
+# 1. Why a Columnar Cache?
+# ------------------------------------------------
+"""
+- Every run re-parses `data.csv` from text: split lines, split fields, convert
+  "25" → 25 ... for every row, every time.
+- The converter writes the CSV ONCE into a binary file:
+  - int columns   → `array("q")` bytes (8 bytes per value)
+  - float columns → `array("d")` bytes (empty cells become NaN)
+  - text columns  → dictionary-encoded: each distinct string stored once,
+                    plus one small integer code per row ("New York" → 0);
+                    strings are decoded only when a value is read
+  - a small JSON header with row count, schema, the requested schema, and the
+    source CSV's size & mtime
+- Short rows are padded: a missing cell counts as empty (NaN / ""). Rows with more
+  cells than the header are rejected with ValueError.
+- A column is "int" only if every value fits in int64 (`array("q")`); larger
+  integers make it "float". A partial `schema` overrides only the columns it
+  names, the others are still inferred.
+- The loader `mmap`s the file and returns `memoryview`s straight over the mapped
+  bytes: no parsing, no copying; the OS pages data in only when it is touched.
+- `load_csv_cached()` rebuilds the cache only when the CSV's size or mtime, or the
+  requested schema, changed.
+"""
+
+MAGIC = b"COL1"
+_PREFIX = struct.Struct("<4sI")  # magic, header length
+ALIGNMENT = 8  # Every column starts on an 8-byte boundary → safe memoryview casts
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# ------------------------------------------------
+# 2. Type Inference
+# ------------------------------------------------
+def _is_int(value):
+    try:
+        return INT64_MIN <= int(value) <= INT64_MAX
+    except ValueError:
+        return False
+
+
+def _is_float(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _read_header(reader, path):
+    header = next(reader, None)
+    if header is None:
+        raise ValueError(f"'{path}' is empty: no header row")
+    return header
+
+
+def _padded(row, width, line_number):
+    if len(row) > width:
+        raise ValueError(f"Line {line_number}: {len(row)} fields, header has {width}")
+    return row + [""] * (width - len(row)) if len(row) < width else row
+
+
+def infer_schema(path, encoding="utf-8"):
+    """One streaming pass: int if every cell is an int64, float if every non-empty
+    cell is a number, otherwise str."""
+    with open(path, "r", newline="", encoding=encoding) as file:
+        reader = csv.reader(file)
+        header = _read_header(reader, path)
+        types = ["int"] * len(header)
+        for row in reader:
+            if not row:
+                continue
+            for index, value in enumerate(_padded(row, len(header), reader.line_num)):
+                kind = types[index]
+                if kind == "int" and not _is_int(value):
+                    kind = "float" if value == "" or _is_float(value) else "str"
+                elif kind == "float" and value != "" and not _is_float(value):
+                    kind = "str"
+                types[index] = kind
+    return dict(zip(header, types))
+
+# ------------------------------------------------
+# 3. Column Builders
+# ------------------------------------------------
+def _codes_typecode(cardinality):
+    if cardinality <= 0xFF:
+        return "B"
+    if cardinality <= 0xFFFF:
+        return "H"
+    return "I"
+
+
+class _DictionaryBuilder:
+    def __init__(self):
+        self.codes = array("I")
+        self.lookup = {}
+
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.lookup)
+        self.codes.append(code)
+
+    def sections(self):
+        values = list(self.lookup)  # Insertion order == code order
+        blobs = [value.encode("utf-8") for value in values]
+        offsets = array("Q", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        codes = array(_codes_typecode(len(values)), self.codes)
+        return {"codes": codes, "offsets": offsets, "strings": b"".join(blobs)}
+
+# ------------------------------------------------
+# 4. Writing the Cache
+# ------------------------------------------------
+def _padding(position):
+    return -position % ALIGNMENT
+
+
+def _to_little_endian(values):
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def convert_csv(csv_path, cache_path, schema=None, encoding="utf-8"):
+    """Write `csv_path` as a columnar cache file. Returns the row count."""
+    stat = os.stat(csv_path)
+    requested_schema = schema
+    with open(csv_path, "r", newline="", encoding=encoding) as file:
+        reader = csv.reader(file)
+        header = _read_header(reader, csv_path)
+        schema = schema or {}
+        unknown = set(schema) - set(header)
+        if unknown:
+            raise ValueError(f"Schema columns not in CSV header: {sorted(unknown)}")
+        if set(header) - set(schema):  # Infer the columns the schema does not name
+            schema = {**infer_schema(csv_path, encoding), **schema}
+        kinds = [schema[name] for name in header]
+        builders = [array("q") if kind == "int" else array("d") if kind == "float" else _DictionaryBuilder()
+                    for kind in kinds]
+        rows = 0
+        for row in reader:
+            if not row:
+                continue
+            for value, kind, builder in zip(_padded(row, len(header), reader.line_num), kinds, builders):
+                if kind == "int":
+                    try:
+                        builder.append(int(value))
+                    except (ValueError, OverflowError):
+                        raise ValueError(f"Line {reader.line_num}: {value!r} is not an int64") from None
+                elif kind == "float":
+                    builder.append(float(value) if value != "" else math.nan)
+                else:
+                    builder.append(value)
+            rows += 1
+
+    # Lay out sections; offsets are relative to the start of the data area
+    sections, columns, position = [], [], 0
+    for name, kind, builder in zip(header, kinds, builders):
+        parts = {"values": builder} if kind != "str" else builder.sections()
+        column = {"name": name, "type": kind}
+        for part, data in parts.items():
+            data = _to_little_endian(data) if isinstance(data, array) else data
+            position += _padding(position)
+            column[part] = {"offset": position, "length": len(data) * (data.itemsize if isinstance(data, array) else 1),
+                            "typecode": data.typecode if isinstance(data, array) else "B"}
+            sections.append((position, data))
+            position += column[part]["length"]
+        columns.append(column)
+
+    header_bytes = json.dumps({
+        "rows": rows,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "requested_schema": requested_schema,
+        "columns": columns,
+    }).encode("utf-8")
+    data_start = _PREFIX.size + len(header_bytes)
+    data_start += _padding(data_start)
+
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        file.write(header_bytes)
+        file.write(b"\0" * (data_start - file.tell()))
+        for offset, data in sections:
+            file.write(b"\0" * (data_start + offset - file.tell()))
+            file.write(data)
+    os.replace(temp_path, cache_path)
+    return rows
+
+# ------------------------------------------------
+# 5. Loading with mmap (zero-copy)
+# ------------------------------------------------
+class StringPool:
+    """Dictionary strings, decoded from the mapped bytes only when asked for."""
+
+    def __init__(self, offsets, strings):
+        self.offsets = offsets
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code):
+        return str(self.strings[self.offsets[code]:self.offsets[code + 1]], "utf-8")
+
+    def to_list(self):
+        return [self[code] for code in range(len(self))]
+
+
+class DictionaryColumn:
+    """Read-only sequence over dictionary codes."""
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.dictionary[self.codes[index]]
+
+    def __iter__(self):
+        # Low-cardinality columns (cities...) decode each distinct string once
+        if len(self.dictionary) <= len(self.codes) // 4:
+            dictionary = self.dictionary.to_list()
+        else:
+            dictionary = self.dictionary
+        return (dictionary[code] for code in self.codes)
+
+
+class ColumnarTable:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a columnar cache file")
+        self.header = json.loads(self._map[_PREFIX.size:_PREFIX.size + header_length])
+        data_start = _PREFIX.size + header_length
+        data_start += _padding(data_start)
+        self._views = []
+        self.columns = {}
+        for column in self.header["columns"]:
+            sections = {part: self._view(data_start, column[part])
+                        for part in ("values", "codes", "offsets", "strings") if part in column}
+            if column["type"] == "str":
+                pool = StringPool(sections["offsets"], sections["strings"])
+                self.columns[column["name"]] = DictionaryColumn(sections["codes"], pool)
+            else:
+                self.columns[column["name"]] = sections["values"]
+
+    def _view(self, data_start, section):
+        start = data_start + section["offset"]
+        view = memoryview(self._map)[start:start + section["length"]]
+        self._views.append(view)
+        if section["typecode"] != "B":
+            view = view.cast(section["typecode"])
+            self._views.append(view)
+        return view
+
+    @property
+    def rows(self):
+        return self.header["rows"]
+
+    @property
+    def schema(self):
+        return {column["name"]: column["type"] for column in self.header["columns"]}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row(self, index):
+        return tuple(column[index] for column in self.columns.values())
+
+    def close(self):
+        # Views must be released before the mmap can be closed
+        self.columns = {}
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_cache_fresh(csv_path, cache_path, schema=None):
+    if not os.path.exists(cache_path):
+        return False
+    stat = os.stat(csv_path)
+    with open(cache_path, "rb") as file:
+        magic, header_length = _PREFIX.unpack(file.read(_PREFIX.size))
+        if magic != MAGIC:
+            return False
+        header = json.loads(file.read(header_length))
+    return (header["source_size"] == stat.st_size and header["source_mtime_ns"] == stat.st_mtime_ns
+            and header.get("requested_schema") == (schema or None))
+
+
+def load_csv_cached(csv_path, cache_path=None, schema=None, encoding="utf-8"):
+    """Return a `ColumnarTable` for `csv_path`, rebuilding the cache if the CSV changed."""
+    cache_path = cache_path or csv_path + ".colcache"
+    if not is_cache_fresh(csv_path, cache_path, schema):
+        convert_csv(csv_path, cache_path, schema, encoding)
+    return ColumnarTable(cache_path)
+
+# ------------------------------------------------
+# 6. Demo (Run This File)
+# ------------------------------------------------
+if __name__ == "__main__":
+    demo_file = "big_data.csv"
+    cities = ["New York", "Los Angeles", "Chicago", "Houston"]
+    with open(demo_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Name", "Age", "City", "Balance"])
+        for i in range(1_000_000):
+            writer.writerow([f"user_{i}", 18 + i % 60, cities[i % 4], round(i * 0.37, 2)])
+
+    start = time.perf_counter()
+    with open(demo_file, "r", newline="") as file:
+        parsed = [(row[0], int(row[1]), row[2], float(row[3])) for row in list(csv.reader(file))[1:]]
+    print(f"Text parse        : {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    load_csv_cached(demo_file).close()
+    print(f"First load (build): {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    with load_csv_cached(demo_file) as table:
+        print(f"Cached load       : {1000 * (time.perf_counter() - start):.2f} ms, {table.rows} rows, {table.schema}")
+        print("Row 42:", table.row(42))
+        print("Sum of Age:", sum(table["Age"]))
+
+    os.remove(demo_file)
+    os.remove(demo_file + ".colcache")
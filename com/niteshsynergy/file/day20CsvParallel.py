@@ -0,0 +1,279 @@
+"""
+Parallel CSV Reader - Newline-aligned Chunks, Process Pool & Typed Columns
+"""
+
+import gc
+import io
+import os
+import re
+import csv
+import mmap
+import time
+import datetime
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+# ------------------------------------------------
+# 1. How the Parallel Reader Works
+# ------------------------------------------------
+"""
+- The file is cut into byte ranges of about `chunk_size` bytes. Every cut is moved
+  forward to the end of a line, so each range holds whole CSV records.
+- Quoted fields may contain newlines ("New\\nYork"). A cut is only allowed at a
+  newline that is OUTSIDE quotes. One pass over the (mmap-ed) file tracks the
+  quote state the way `csv.reader` does: a quote char opens a quoted field only
+  at the START of a field (`5'11",` is a literal quote), `""` inside a quoted
+  field is an escaped quote. A regex tokenises the file in 1 MB windows, in C.
+- The quote char and delimiter come from the dialect; dialects with an
+  `escapechar` (or `doublequote=False`) are rejected.
+- Each range is parsed by `csv.reader` in a worker process, and the columns in the
+  schema are converted (int / float / date / datetime / str / any callable).
+  Empty typed fields become None; columns not in the schema stay strings.
+- Results come back IN FILE ORDER, at most `max_in_flight` chunks at a time, as
+  row batches (lists of tuples) or column batches (dict of columns).
+- Workers send COLUMNS back: int / float columns without gaps as `array`
+  objects and dates as ordinals, which are far cheaper to pickle than millions
+  of Python objects. In column mode those numeric arrays are returned as-is.
+"""
+
+CHUNK_SIZE = 16 << 20  # 16 MB per task
+
+CONVERTERS = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "date": datetime.date.fromisoformat,
+    "datetime": datetime.datetime.fromisoformat,
+}
+ARRAY_TYPECODES = {int: "q", float: "d"}
+DATE_ORDINALS = "date-ordinals"
+
+# ------------------------------------------------
+# 2. Finding Safe Chunk Boundaries
+# ------------------------------------------------
+def _scan_options(dialect, encoding):
+    """Quote byte (None for QUOTE_NONE), delimiter byte and skipinitialspace of `dialect`."""
+    dialect = csv.get_dialect(dialect) if isinstance(dialect, str) else dialect
+    if dialect.escapechar is not None or not dialect.doublequote:
+        raise ValueError("Dialects with an escapechar are not supported by the parallel reader")
+    delimiter = dialect.delimiter.encode(encoding)
+    quote = None if dialect.quoting == csv.QUOTE_NONE else dialect.quotechar.encode(encoding)
+    if len(delimiter) != 1 or (quote is not None and len(quote) != 1):
+        raise ValueError(f"Delimiter and quote char must be single bytes in {encoding}")
+    return quote, delimiter[0], dialect.skipinitialspace
+
+
+class _RecordScanner:
+    """Walks the file once, front to back, tracking whether a position is inside
+    a quoted field exactly like `csv.reader`."""
+
+    WINDOW = 1 << 20  # The regex keeps a backtracking entry per token: match 1 MB at a time
+
+    def __init__(self, data, quote, delimiter, skipinitialspace):
+        self.data = data
+        self.quote = quote
+        self.position = 0  # Always a position OUTSIDE quotes; everything before it is scanned
+        self.pattern = None
+        if quote is not None:
+            q, d = re.escape(quote), re.escape(bytes([delimiter]))
+            field_start = rb"(?<![^" + d + rb"\r\n])" + (rb" *" if skipinitialspace else b"")
+            quoted = field_start + q + rb"[^" + q + rb"]*(?:" + q + q + rb"[^" + q + rb"]*)*"
+            self.pattern = re.compile(
+                rb"(?:[^" + q + rb"]+"                 # Unquoted text
+                + rb"|" + quoted + q + rb"(?!" + q + rb")"  # Closed quoted field ("" = escaped quote)
+                + rb"|(?P<open>" + quoted + rb"\Z)"    # Quoted field still open at the end
+                + rb"|" + q + rb")*")                  # Quote inside an unquoted field: literal
+
+    def _in_quotes(self, target):
+        """Scan up to `target`; True if `target` lies inside a quoted field."""
+        window = self.WINDOW
+        while True:
+            end = min(target, self.position + window)
+            while end < target and self.data[end - 1] == self.quote[0]:
+                end -= 1  # Never split a "" pair between two windows
+            if end <= self.position:
+                window *= 2
+                continue
+            opened = self.pattern.match(self.data, self.position, end).start("open")
+            if end == target:
+                self.position = opened if opened >= 0 else target
+                return opened >= 0
+            if opened < 0:
+                self.position = end
+            elif opened > self.position:
+                self.position = opened  # Rescan the open field with the next window
+            else:
+                window *= 2  # One quoted field longer than the window
+
+    def record_end(self, position):
+        """Offset just after the first newline at or after `position` that is outside quotes."""
+        while True:
+            newline = self.data.find(b"\n", max(position, self.position))
+            if newline < 0:
+                return len(self.data)
+            if self.pattern is None or not self._in_quotes(newline):
+                return newline + 1
+            position = newline + 1
+
+
+def plan_chunks(path, chunk_size=CHUNK_SIZE, dialect="excel", encoding="utf-8"):
+    """Return `(header_end, [(start, end), ...])` with quote-safe boundaries."""
+    quote, delimiter, skipinitialspace = _scan_options(dialect, encoding)
+    size = os.path.getsize(path)
+    if not size:
+        return 0, []
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        scanner = _RecordScanner(data, quote, delimiter, skipinitialspace)
+        header_end = scanner.record_end(0)
+        boundaries = [header_end]
+        for start in range(chunk_size, size, chunk_size):
+            if start > boundaries[-1]:
+                end = scanner.record_end(start)
+                if end > boundaries[-1]:
+                    boundaries.append(end)
+        if boundaries[-1] < size:
+            boundaries.append(size)
+    return header_end, list(zip(boundaries, boundaries[1:]))
+
+# ------------------------------------------------
+# 3. Parsing One Chunk (runs in a worker)
+# ------------------------------------------------
+@contextmanager
+def _gc_paused():
+    # Hundreds of thousands of new lists / tuples would trigger the cyclic GC over
+    # and over (none of them form cycles) → pause it while a chunk is built.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _converter(spec):
+    if spec is None or callable(spec):
+        return spec
+    return CONVERTERS[spec]
+
+
+def _convert_column(values, converter):
+    if converter is None:
+        return values
+    try:
+        return list(map(converter, values))  # Fast path: C-level loop, no gaps
+    except ValueError:
+        return [converter(value) if value else None for value in values]
+
+
+def _pack_column(values, converter):
+    # What travels back from a worker: numeric columns without gaps as `array`,
+    # dates as an array of ordinals (pickling date objects is ~100x slower).
+    if None not in values:
+        typecode = ARRAY_TYPECODES.get(converter)
+        if typecode:
+            try:
+                return array(typecode, values)
+            except OverflowError:
+                return values  # An int beyond int64 ("q"): keep the plain list
+        if converter == datetime.date.fromisoformat:  # Bound classmethods: compare with ==
+            return (DATE_ORDINALS, array("i", map(datetime.date.toordinal, values)))
+    return values
+
+
+def _unpack_column(column):
+    if isinstance(column, tuple) and column[0] == DATE_ORDINALS:
+        return list(map(datetime.date.fromordinal, column[1]))
+    return column
+
+
+def parse_chunk(path, start, end, converters, encoding="utf-8", dialect="excel"):
+    """Parse one byte range into packed, typed columns."""
+    with _gc_paused():
+        with open(path, "rb") as file:
+            file.seek(start)
+            text = file.read(end - start).decode(encoding)
+        rows = [row for row in csv.reader(io.StringIO(text, newline=""), dialect) if row]
+        width = len(converters)
+        bad = next((row for row in rows if len(row) != width), None)
+        if bad is not None:
+            raise ValueError(f"Expected {width} fields, got {len(bad)}: {bad}")
+        # Column by column: one map() per column instead of a Python loop per field
+        return [_pack_column(_convert_column([row[index] for row in rows], converter), converter)
+                for index, converter in enumerate(converters)]
+
+# ------------------------------------------------
+# 4. Parallel Reader
+# ------------------------------------------------
+def read_header(path, encoding="utf-8", dialect="excel"):
+    with open(path, "r", newline="", encoding=encoding) as file:
+        return next(csv.reader(file, dialect), [])
+
+
+def read_csv_parallel(path, schema=None, workers=None, chunk_size=CHUNK_SIZE, as_columns=False,
+                      max_in_flight=None, encoding="utf-8", dialect="excel"):
+    """Yield typed row batches (or `{column: values}` batches) in file order.
+    `schema` maps column name → "int" / "float" / "date" / "datetime" / "str" / callable."""
+    schema = schema or {}
+    header = read_header(path, encoding, dialect)
+    unknown = set(schema) - set(header)
+    if unknown:
+        raise ValueError(f"Schema columns not in CSV header: {sorted(unknown)}")
+    converters = [_converter(schema.get(column)) for column in header]
+    _, chunks = plan_chunks(path, chunk_size, dialect, encoding)
+    workers = workers or os.cpu_count()
+    max_in_flight = max_in_flight or workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, end in chunks:
+            pending.append(executor.submit(parse_chunk, path, start, end, converters, encoding, dialect))
+            if len(pending) >= max_in_flight:
+                yield _label(header, pending.popleft().result(), as_columns)
+        while pending:
+            yield _label(header, pending.popleft().result(), as_columns)
+
+
+def _label(header, columns, as_columns):
+    with _gc_paused():
+        columns = [_unpack_column(column) for column in columns]
+        if as_columns:
+            return dict(zip(header, columns))
+        return list(zip(*columns))
+
+
+def read_csv_typed(path, schema=None, **options):
+    """Convenience: iterate typed rows one by one."""
+    for batch in read_csv_parallel(path, schema, **options):
+        yield from batch
+
+# ------------------------------------------------
+# 5. Benchmark vs the Plain `csv.reader` Loop
+# ------------------------------------------------
+if __name__ == "__main__":
+    demo_file = "big_data.csv"
+    with open(demo_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Name", "Age", "City", "Joined"])
+        for i in range(3_000_000):
+            city = "New\nYork" if i % 1000 == 0 else "Los Angeles, CA"  # Quoted newlines & commas
+            writer.writerow([f"user_{i}", 18 + i % 60, city, f"2024-01-{1 + i % 28:02d}"])
+    schema = {"Age": "int", "Joined": "date"}
+
+    start = time.perf_counter()
+    with open(demo_file, "r", newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        baseline = [(row[0], int(row[1]), row[2], datetime.date.fromisoformat(row[3])) for row in reader]
+    baseline_time = time.perf_counter() - start
+    print(f"csv.reader loop : {len(baseline)} rows in {baseline_time:.2f}s")
+
+    start = time.perf_counter()
+    rows = sum(len(batch) for batch in read_csv_parallel(demo_file, schema, chunk_size=8 << 20))
+    parallel_time = time.perf_counter() - start
+    print(f"parallel reader : {rows} rows in {parallel_time:.2f}s "
+          f"(x{baseline_time / parallel_time:.1f} on {os.cpu_count()} cores)")
+
+    os.remove(demo_file)
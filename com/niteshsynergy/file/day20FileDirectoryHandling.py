@@ -65,6 +65,9 @@ with open("output.txt", "a") as file:
 
 print("Data appended to output.txt")
 
+# Reopening the file for every line is slow at high rates: keep one `AppendWriter`
+# from day20AppendWriter.py open instead (buffered, thread-safe, fsync knob).
+
 # ------------------------------------------------
 # 6. Line Count in a File
 # ------------------------------------------------
@@ -73,6 +76,9 @@ with open("sample.txt", "r") as file:
 
 print(f"Total lines in sample.txt: {line_count}")
 
+# `readlines()` loads the whole file into memory - fine for small files only.
+# For huge files use `count_lines()` / `LineIndex` from day20LineIndex.py.
+
 # ------------------------------------------------
 # 7. Directory Handling - Creating, Listing, Removing Directories
 # ------------------------------------------------
@@ -147,6 +153,9 @@ with open("data.pkl", "rb") as file:
     loaded_data = pickle.load(file)
     print("Loaded Data:", loaded_data)
 
+# For large arrays / buffers use `dump_oob()` / `load_oob()` from day20PickleOOB.py
+# (protocol 5, buffers kept out of band in an mmap-ed sidecar file).
+
 # ------------------------------------------------
 # 12. JSON Parsing (Handling JSON Data)
 # ------------------------------------------------
@@ -169,6 +178,9 @@ with open("data.json", "r") as file:
     loaded_json = json.load(file)
     print("Loaded JSON Data:", loaded_json)
 
+# For large data use NDJSON (`NdjsonWriter` / `read_ndjson()`) or stream one huge
+# array with `iter_json_array()` from day20JsonStream.py.
+
 # ------------------------------------------------
 # 13. XML Parsing
 # ------------------------------------------------
@@ -200,6 +212,9 @@ for person in root.findall("person"):
     city = person.find("city").text
     print(f"XML Parsed Data: Name={name}, Age={age}, City={city}")
 
+# `ET.parse()` builds the whole tree in memory. For large XML stream records with
+# `iter_records()` / `xml_to_csv()` / `xml_to_ndjson()` from day20XmlStream.py.
+
 # ------------------------------------------------
 # Summary
 # ------------------------------------------------
@@ -0,0 +1,187 @@
+"""
+Streaming JSON - NDJSON Reader/Writer & Incremental Top-level Array Parser
+"""
+
+import os
+import re
+import json
+import time
+import tracemalloc
+
+# ------------------------------------------------
+# 1. Why Stream JSON?
+# ------------------------------------------------
+"""
+- `json.load(file)` builds the WHOLE document in memory before you see record 1.
+- `json.dump(..., indent=4)` is slow and bloats the file with whitespace.
+- NDJSON (newline-delimited JSON): one compact JSON object per line.
+  - Writer: records are encoded compactly and written in batches (one `write()`
+    per `batch_size` records, not per record).
+  - Reader: one line → one record; memory holds a single record at a time.
+- Existing files that are ONE huge JSON array (`[{...}, {...}, ...]`) are read
+  with `iter_json_array()`: it reads fixed-size chunks and pulls out one element
+  at a time with `JSONDecoder.raw_decode()`.
+"""
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+# ------------------------------------------------
+# 2. NDJSON Writer (buffered, batched)
+# ------------------------------------------------
+class NdjsonWriter:
+    def __init__(self, path, batch_size=1000, append=False, encoding="utf-8"):
+        self.path = path
+        self.batch_size = batch_size
+        self._file = open(path, "a" if append else "w", encoding=encoding, newline="\n")
+        self._pending = []
+        self.written = 0
+
+    def write(self, record):
+        self._pending.append(_ENCODER.encode(record))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._pending:
+            self._pending.append("")  # Trailing newline after the last record
+            self._file.write("\n".join(self._pending))
+            self.written += len(self._pending) - 1
+            self._pending = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_ndjson(path, records, batch_size=1000):
+    with NdjsonWriter(path, batch_size) as writer:
+        writer.write_many(records)
+        writer.flush()
+        return writer.written
+
+# ------------------------------------------------
+# 3. NDJSON Reader (one record at a time)
+# ------------------------------------------------
+def read_ndjson(path, encoding="utf-8"):
+    with open(path, "r", encoding=encoding) as file:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON ({e.msg})") from None
+
+# ------------------------------------------------
+# 4. Incremental Parser for One Huge JSON Array
+# ------------------------------------------------
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+def iter_json_array(path, chunk_size=1 << 16, encoding="utf-8"):
+    """Yield the elements of a top-level JSON array without loading the file."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding=encoding) as file:
+        buffer, position, eof = "", 0, False
+
+        def fill():
+            nonlocal buffer, position, eof
+            # Grow at least geometrically so one huge element is not re-parsed per chunk
+            chunk = file.read(max(chunk_size, len(buffer) - position))
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk  # Drop what was already consumed
+            position = 0
+
+        def skip_whitespace():
+            nonlocal position
+            while True:
+                position = _WHITESPACE.match(buffer, position).end()
+                if position < len(buffer) or eof:
+                    return
+                fill()
+
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] != "[":
+            raise ValueError(f"{path}: top-level value is not a JSON array")
+        position += 1
+        expect_value, after_comma = True, False
+
+        while True:
+            skip_whitespace()
+            if position >= len(buffer):
+                raise ValueError(f"{path}: unexpected end of file inside the array")
+            char = buffer[position]
+            if char == "]":
+                if after_comma:
+                    raise ValueError(f"{path}: trailing ',' before ']'")
+                position += 1
+                skip_whitespace()
+                if position < len(buffer):
+                    raise ValueError(f"{path}: extra data after the array")
+                return
+            if char == ",":
+                if expect_value:
+                    raise ValueError(f"{path}: unexpected ','")
+                position += 1
+                expect_value, after_comma = True, True
+                continue
+            if not expect_value:
+                raise ValueError(f"{path}: expected ',' or ']'")
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()  # Element is cut by the chunk edge → read more and retry
+                continue
+            if not eof and isinstance(value, (int, float)) and (end == len(buffer) or buffer[end] in _NUMBER_CHARS):
+                fill()  # The number may continue in the next chunk ("12" | "3.5")
+                continue
+            position = end
+            expect_value, after_comma = False, False
+            yield value
+
+# ------------------------------------------------
+# 5. Benchmark vs `json.load`
+# ------------------------------------------------
+def measure(label, func):
+    """Print the record count `func()` returns, its run time and its peak traced memory."""
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()  # Second run for memory: tracing slows everything down
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {count:>8} records  {elapsed:6.2f}s  peak {peak / 2 ** 20:8.1f} MB")
+
+
+if __name__ == "__main__":
+    records = ({"name": f"user_{i}", "age": 18 + i % 60, "city": "San Francisco"} for i in range(500_000))
+    with open("big_array.json", "w") as file:
+        json.dump(list(records), file, indent=4)
+    write_ndjson("big.ndjson", ({"name": f"user_{i}", "age": 18 + i % 60, "city": "San Francisco"}
+                                for i in range(500_000)))
+
+    def load_whole():
+        with open("big_array.json", "r") as file:
+            return len(json.load(file))
+
+    measure("json.load", load_whole)
+    measure("iter_json_array", lambda: sum(1 for _ in iter_json_array("big_array.json")))
+    measure("read_ndjson", lambda: sum(1 for _ in read_ndjson("big.ndjson")))
+
+    os.remove("big_array.json")
+    os.remove("big.ndjson")
@@ -0,0 +1,261 @@
+"""
+Huge File Line Counting & Line Index - Constant Memory, Multi-core
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+# ------------------------------------------------
+# 1. Why Not `len(file.readlines())`?
+# ------------------------------------------------
+"""
+- `readlines()` decodes the WHOLE file and builds one string per line → a 20 GB
+  file needs more than 20 GB of RAM.
+- Counting `b"\\n"` in large binary chunks needs only one chunk of memory and no
+  decoding at all; `bytes.count()` runs in C.
+- Big files are split into byte ranges and counted by several processes.
+- A sparse line index stores the byte offset of every `every`-th line start.
+  "Give me line N" = one seek + at most `every - 1` readline calls, not a rescan.
+- The index is saved next to the file (`<file>.lidx`) together with the file's
+  size & mtime; it is rebuilt automatically when the file changes.
+"""
+
+CHUNK_SIZE = 1 << 20      # 1 MB reads
+PARALLEL_MIN_SIZE = 64 << 20  # Below this, one process is faster than starting a pool
+
+# ------------------------------------------------
+# 2. Counting Newlines in a Byte Range
+# ------------------------------------------------
+def _iter_chunks(path, start=0, end=None, chunk_size=CHUNK_SIZE):
+    end = os.path.getsize(path) if end is None else end
+    buffer = bytearray(chunk_size)
+    with open(path, "rb", buffering=0) as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            size = min(size, end - position)
+            yield position, memoryview(buffer)[:size]
+            position += size
+
+
+def count_newlines(path, start=0, end=None, chunk_size=CHUNK_SIZE):
+    total = 0
+    for _, chunk in _iter_chunks(path, start, end, chunk_size):
+        total += chunk.obj.count(b"\n", 0, len(chunk))
+    return total
+
+
+def _ends_without_newline(path, size):
+    if size == 0:
+        return False
+    with open(path, "rb") as file:
+        file.seek(size - 1)
+        return file.read(1) != b"\n"
+
+
+def _split_ranges(size, parts):
+    step = max(1, -(-size // parts))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+# ------------------------------------------------
+# 3. Line Counting (chunked / mmap / parallel)
+# ------------------------------------------------
+def count_lines(path, chunk_size=CHUNK_SIZE):
+    """Same result as `len(open(path).readlines())`, in constant memory."""
+    size = os.path.getsize(path)
+    return count_newlines(path, 0, size, chunk_size) + _ends_without_newline(path, size)
+
+
+def count_lines_mmap(path, chunk_size=CHUNK_SIZE):
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    total = 0
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for start in range(0, size, chunk_size):
+            total += mapped[start:start + chunk_size].count(b"\n")
+        return total + (mapped[size - 1:size] != b"\n")
+
+
+def count_lines_parallel(path, workers=None, chunk_size=CHUNK_SIZE):
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count()
+    if size < PARALLEL_MIN_SIZE or workers == 1:
+        return count_lines(path, chunk_size)
+    ranges = _split_ranges(size, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        counts = executor.map(count_newlines, [path] * len(ranges), *zip(*ranges))
+        return sum(counts) + _ends_without_newline(path, size)
+
+# ------------------------------------------------
+# 4. Sparse Line Offset Index
+# ------------------------------------------------
+def _nth_newline(buffer, start, end, n, block=8192):
+    """Position of the n-th newline in buffer[start:end], or (-1, n - found)."""
+    while start < end:
+        stop = min(start + block, end)
+        found = buffer.count(b"\n", start, stop)
+        if found >= n:
+            position = start - 1
+            for _ in range(n):
+                position = buffer.find(b"\n", position + 1, stop)
+            return position, 0
+        n -= found
+        start = stop
+    return -1, n
+
+
+def _range_marks(path, start, end, newlines_before, every, chunk_size=CHUNK_SIZE):
+    """Offsets of line starts in [start, end) whose line number is a multiple of `every`."""
+    marks = array("Q")
+    seen = newlines_before
+    for position, chunk in _iter_chunks(path, start, end, chunk_size):
+        buffer, length, cursor = chunk.obj, len(chunk), 0
+        while True:
+            needed = every - seen % every
+            newline, missing = _nth_newline(buffer, cursor, length, needed)
+            if newline < 0:
+                seen += needed - missing
+                break
+            seen += needed
+            marks.append(position + newline + 1)
+            cursor = newline + 1
+    return marks
+
+
+_INDEX_HEADER = struct.Struct("<4sQQQQ")  # magic, every, lines, file size, mtime_ns
+_INDEX_MAGIC = b"LIX1"
+
+
+class LineIndex:
+    def __init__(self, path, every, total_lines, offsets):
+        self.path = path
+        self.every = every
+        self.total_lines = total_lines
+        self.offsets = offsets
+
+    def __len__(self):
+        return self.total_lines
+
+    # --- Building ---
+    @classmethod
+    def build(cls, path, every=1000, workers=None, chunk_size=CHUNK_SIZE):
+        size = os.path.getsize(path)
+        workers = workers or os.cpu_count()
+        ranges = _split_ranges(size, workers if size >= PARALLEL_MIN_SIZE else 1)
+        if len(ranges) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                counts = list(executor.map(count_newlines, [path] * len(ranges), *zip(*ranges)))
+                befores = [sum(counts[:i]) for i in range(len(ranges))]
+                parts = executor.map(_range_marks, [path] * len(ranges), *zip(*ranges),
+                                     befores, [every] * len(ranges))
+                offsets = array("Q", [0])
+                for part in parts:
+                    offsets.extend(part)
+            newlines = sum(counts)
+        else:
+            offsets = array("Q", [0])
+            offsets.extend(_range_marks(path, 0, size, 0, every, chunk_size))
+            newlines = count_newlines(path, 0, size, chunk_size)
+
+        total_lines = newlines + _ends_without_newline(path, size)
+        if offsets and offsets[-1] >= size:  # File ends with "\n": no line starts at EOF
+            offsets.pop()
+        return cls(path, every, total_lines, offsets)
+
+    # --- Persistence ---
+    @staticmethod
+    def index_path(path):
+        return path + ".lidx"
+
+    def save(self, index_path=None):
+        stat = os.stat(self.path)
+        index_path = index_path or self.index_path(self.path)
+        offsets = self.offsets
+        if sys.byteorder != "little":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        temp_path = index_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, self.every, self.total_lines, stat.st_size, stat.st_mtime_ns))
+            offsets.tofile(file)
+        os.replace(temp_path, index_path)
+
+    @classmethod
+    def load(cls, path, index_path=None):
+        """Return the saved index, or None if missing or stale."""
+        index_path = index_path or cls.index_path(path)
+        if not os.path.exists(index_path):
+            return None
+        stat = os.stat(path)
+        with open(index_path, "rb") as file:
+            magic, every, total_lines, size, mtime_ns = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+            if magic != _INDEX_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                return None
+            offsets = array("Q")
+            offsets.frombytes(file.read())
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        return cls(path, every, total_lines, offsets)
+
+    @classmethod
+    def load_or_build(cls, path, every=1000, workers=None):
+        index = cls.load(path)
+        if index is None or index.every != every:
+            index = cls.build(path, every, workers)
+            index.save()
+        return index
+
+    # --- Random Access ---
+    def _seek_line(self, file, n):
+        if not 0 <= n < self.total_lines:
+            raise IndexError(f"line {n} out of range (0..{self.total_lines - 1})")
+        file.seek(self.offsets[n // self.every])
+        for _ in range(n % self.every):
+            file.readline()
+
+    def line(self, n, encoding="utf-8"):
+        """Line `n` (0-based) without its line ending."""
+        with open(self.path, "rb") as file:
+            self._seek_line(file, n)
+            return file.readline().rstrip(b"\r\n").decode(encoding)
+
+    def lines(self, start, stop, encoding="utf-8"):
+        """Yield lines `start <= n < stop`."""
+        stop = min(stop, self.total_lines)
+        if start >= stop:
+            return
+        with open(self.path, "rb") as file:
+            self._seek_line(file, start)
+            for _ in range(stop - start):
+                yield file.readline().rstrip(b"\r\n").decode(encoding)
+
+# ------------------------------------------------
+# 5. Demo (Run This File)
+# ------------------------------------------------
+if __name__ == "__main__":
+    demo_file = "big_sample.txt"
+    with open(demo_file, "w") as file:
+        for i in range(2_000_000):
+            file.write(f"line {i}: some log text for testing\n")
+
+    for label, func in (("chunked", count_lines), ("mmap", count_lines_mmap), ("parallel", count_lines_parallel)):
+        start = time.perf_counter()
+        print(f"{label:>8}: {func(demo_file)} lines in {time.perf_counter() - start:.3f}s")
+
+    index = LineIndex.load_or_build(demo_file, every=1000)
+    start = time.perf_counter()
+    print("Line 1,234,567:", index.line(1_234_567))
+    print("Lines 10..12:", list(index.lines(10, 13)))
+    print(f"Random access took {1000 * (time.perf_counter() - start):.2f} ms")
+
+    os.remove(demo_file)
+    os.remove(LineIndex.index_path(demo_file))
@@ -0,0 +1,278 @@
+"""
+Pickle Protocol 5 - Out-of-band Buffers in an mmap-able Sidecar File
+"""
+
+import io
+import os
+import mmap
+import secrets
+import time
+import zlib
+import pickle
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# ------------------------------------------------
+# 1. Why Out-of-band Buffers?
+# ------------------------------------------------
+"""
+- A plain `pickle.dump()` copies every large buffer INTO the pickle stream
+  (`array.tobytes()`, ...): a 500 MB array briefly needs 1 GB. `pickle.load()`
+  reads the whole file into memory and then copies the data again into new objects.
+- Protocol 5 lets objects hand their memory to pickle as a `PickleBuffer`.
+  With `buffer_callback=` those buffers are NOT written into the stream:
+  - `dump_oob()` writes the small pickle stream to `<file>` and the big buffers,
+    straight from the objects' memory, to the sidecar `<file>.buffers`
+    (each one 64-byte aligned).
+  - `load_oob()` `mmap`s the sidecar and passes memoryviews over the mapping as
+    `buffers=`; objects are rebuilt ON the mapped pages. Nothing is copied and
+    the OS reads pages only when they are touched.
+- Only types that support out-of-band pickling are rebuilt without a copy:
+  `ZeroCopyArray` below (a typed view, like `array.array`) or a NumPy array.
+- `bytes`, `bytearray` and `array.array` do not: pickle copies them into the
+  stream. `dump_oob()` sends them to the sidecar anyway (via `persistent_id`),
+  so dumping never doubles their memory; loading them makes ONE copy out of the
+  mapping, instead of reading the whole stream and copying again.
+  The price is one Python call per pickled object: dumps of many small objects
+  are ~2x slower than `pickle.dumps()`.
+- Buffers smaller than `min_size` stay in-band: a sidecar entry is not worth it.
+- Loaded objects are read-only (`writable=True` maps copy-on-write instead).
+- Both files carry the same random token and the sidecar's size. The two files are
+  replaced one after the other, so a crash (or a reader) in between could see a
+  new stream with an old sidecar: `load_oob()` detects that and raises instead of
+  rebuilding objects over the wrong bytes.
+"""
+
+MAGIC = b"PKB5"
+SIDECAR_MAGIC = b"PKS5"
+_HEADER = struct.Struct("<4sI16sQ")     # magic, buffer count, token, sidecar size
+_SIDECAR_HEADER = struct.Struct("<4s16sQ")  # magic, token, sidecar size
+_ENTRY = struct.Struct("<QQ")           # offset, length in the sidecar
+ALIGNMENT = 64
+MIN_OOB_SIZE = 1 << 16              # 64 KB
+
+# ------------------------------------------------
+# 2. A Typed Array that Pickles Out of Band
+# ------------------------------------------------
+class ZeroCopyArray:
+    """Typed sequence over any buffer (`array.array`, bytes, mmap, ...)."""
+
+    def __init__(self, data, typecode=None):
+        view = memoryview(data)
+        typecode = typecode or view.format
+        self.view = view if view.format == typecode else view.cast("B").cast(typecode)
+
+    @property
+    def typecode(self):
+        return self.view.format
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, index):
+        return self.view[index]
+
+    def __iter__(self):
+        return iter(self.view)
+
+    def to_array(self):
+        return array(self.typecode, self.view)  # Explicit copy
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return _rebuild_array, (pickle.PickleBuffer(self.view), self.typecode)
+        return _rebuild_array, (self.view.tobytes(), self.typecode)
+
+
+def _rebuild_array(buffer, typecode):
+    return ZeroCopyArray(buffer, typecode)
+
+# ------------------------------------------------
+# 3. Dump: Stream + Sidecar
+# ------------------------------------------------
+def sidecar_path(path):
+    return path + ".buffers"
+
+
+def _padding(position):
+    return -position % ALIGNMENT
+
+
+class _OutOfBandPickler(pickle.Pickler):
+    """Protocol 5 pickler that also sends large bytes / bytearray / array.array
+    values out of band. Plain pickle always copies them into the stream, and the
+    C pickler never offers them to `reducer_override`, so `persistent_id` (asked
+    for every object) swaps them for an id that carries a `PickleBuffer`."""
+
+    def __init__(self, file, min_size, buffer_callback):
+        super().__init__(file, protocol=5, buffer_callback=buffer_callback)
+        self.min_size = min_size
+        self._sent = {}  # id(obj) → (index, obj): a value referenced twice is stored once
+
+    def persistent_id(self, obj):
+        kind = type(obj)
+        if kind is array:
+            size, typecode = len(obj) * obj.itemsize, obj.typecode
+        elif kind is bytes or kind is bytearray:
+            size, typecode = len(obj), None
+        else:
+            return None
+        if size < self.min_size:
+            return None
+        seen = self._sent.get(id(obj))
+        if seen is not None:
+            return ("ref", seen[0])
+        self._sent[id(obj)] = (len(self._sent), obj)
+        return (kind.__name__, typecode, pickle.PickleBuffer(obj))
+
+
+class _OutOfBandUnpickler(pickle.Unpickler):
+    def __init__(self, file, buffers):
+        super().__init__(file, buffers=buffers)
+        self._loaded = []
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "ref":
+            return self._loaded[pid[1]]
+        _, typecode, buffer = pid
+        if kind == "array":
+            value = array(typecode)
+            value.frombytes(buffer)  # One copy out of the mapped pages
+        elif kind == "bytes":
+            value = bytes(buffer)
+        elif kind == "bytearray":
+            value = bytearray(buffer)
+        else:
+            raise pickle.UnpicklingError(f"Unknown persistent id {kind!r}")
+        self._loaded.append(value)
+        return value
+
+
+def dump_oob(obj, path, min_size=MIN_OOB_SIZE):
+    """Pickle `obj` to `path` with large buffers in `<path>.buffers`. Returns the buffer count."""
+    buffers = []
+
+    def keep_out_of_band(buffer):
+        if buffer.raw().nbytes < min_size:
+            return True  # Serialize in-band
+        buffers.append(buffer)
+        return False
+
+    stream = io.BytesIO()
+    _OutOfBandPickler(stream, min_size, keep_out_of_band).dump(obj)
+    payload = stream.getvalue()
+
+    token = secrets.token_bytes(16)
+    entries, position = [], _SIDECAR_HEADER.size
+    data_path = sidecar_path(path)
+    with open(data_path + ".tmp", "wb") as file:
+        file.write(b"\0" * _SIDECAR_HEADER.size)  # Filled in once the size is known
+        for buffer in buffers:
+            raw = buffer.raw()  # Contiguous view of the object's memory, no copy
+            position += _padding(position)
+            file.seek(position)
+            file.write(raw)
+            entries.append((position, raw.nbytes))
+            position += raw.nbytes
+            buffer.release()
+        file.seek(0)
+        file.write(_SIDECAR_HEADER.pack(SIDECAR_MAGIC, token, position))
+
+    with open(path + ".tmp", "wb") as file:
+        file.write(_HEADER.pack(MAGIC, len(entries), token, position))
+        for entry in entries:
+            file.write(_ENTRY.pack(*entry))
+        file.write(payload)
+
+    # Two separate renames: the shared token lets load_oob() detect a mismatched pair
+    os.replace(data_path + ".tmp", data_path)
+    os.replace(path + ".tmp", path)
+    return len(entries)
+
+# ------------------------------------------------
+# 4. Load: mmap the Sidecar, Rebuild Over It
+# ------------------------------------------------
+def load_oob(path, writable=False):
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"'{path}' is not an out-of-band pickle file")
+        _, count, token, sidecar_size = _HEADER.unpack(header)
+        entries = [_ENTRY.unpack(file.read(_ENTRY.size)) for _ in range(count)]
+        payload = file.read()
+
+    buffers = []
+    if entries:
+        data_path = sidecar_path(path)
+        with open(data_path, "rb") as file:
+            header = file.read(_SIDECAR_HEADER.size)
+            if len(header) != _SIDECAR_HEADER.size or header[:4] != SIDECAR_MAGIC:
+                raise ValueError(f"'{data_path}' is not a buffer sidecar file")
+            _, sidecar_token, size = _SIDECAR_HEADER.unpack(header)
+            if sidecar_token != token or size != sidecar_size:
+                raise ValueError(f"'{data_path}' does not belong to '{path}' (interrupted dump?)")
+            if os.fstat(file.fileno()).st_size != size:
+                raise ValueError(f"'{data_path}' is truncated")
+            # The mapping stays alive as long as any rebuilt object references it
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        for offset, length in entries:
+            buffers.append(view[offset:offset + length])
+    return _OutOfBandUnpickler(io.BytesIO(payload), buffers).load()
+
+
+def remove_oob(path):
+    for file_path in (path, sidecar_path(path)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+# ------------------------------------------------
+# 5. Benchmark vs Plain `pickle.dump` / `pickle.load`
+# ------------------------------------------------
+def _max_rss_mb():
+    import resource  # Unix only
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _bench_dump(mode, path, count):
+    # Each step runs in a fresh process, so its peak RSS is not hidden by an earlier one
+    values = array("d", range(count))
+    data = {"name": "prices", "values": values if mode == "plain" else ZeroCopyArray(values)}
+    baseline = _max_rss_mb()
+    start = time.perf_counter()
+    if mode == "plain":
+        with open(path, "wb") as file:
+            pickle.dump(data, file)
+    else:
+        dump_oob(data, path)
+    return time.perf_counter() - start, _max_rss_mb() - baseline
+
+
+def _bench_load(mode, path):
+    baseline = _max_rss_mb()
+    start = time.perf_counter()
+    if mode == "plain":
+        with open(path, "rb") as file:
+            values = memoryview(pickle.load(file)["values"])
+    else:
+        values = load_oob(path)["values"].view
+    checksum = zlib.crc32(values.cast("B"))  # Touch every page
+    return time.perf_counter() - start, _max_rss_mb() - baseline, checksum
+
+
+def _run_fresh(func, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+
+if __name__ == "__main__":
+    count = 20_000_000  # 160 MB of doubles
+    print(f"{'mode':<6} {'dump':>7} {'dump +RSS':>10} {'load':>7} {'load +RSS':>10}")
+    for mode, path in (("plain", "data_plain.pkl"), ("oob", "data_oob.pkl")):
+        dump_time, dump_rss = _run_fresh(_bench_dump, mode, path, count)
+        load_time, load_rss, checksum = _run_fresh(_bench_load, mode, path)
+        print(f"{mode:<6} {dump_time:6.2f}s {dump_rss:7.0f} MB {load_time:6.2f}s {load_rss:7.0f} MB  crc={checksum:08x}")
+        remove_oob(path)
@@ -0,0 +1,145 @@
+"""
+Streaming XML - `iterparse` Record Extraction with Flat Memory
+"""
+
+import os
+import csv
+import xml.etree.ElementTree as ET
+
+from com.niteshsynergy.file.day20JsonStream import NdjsonWriter, measure
+
+# ------------------------------------------------
+# 1. Why `iterparse`?
+# ------------------------------------------------
+"""
+- `ET.parse("data.xml")` builds the WHOLE tree before `findall("person")` runs:
+  a multi-GB document needs several times its size in RAM.
+- `ET.iterparse()` reports each element as soon as its end tag is read.
+  A record (`<person>...</person>`) is complete at that moment → read its fields,
+  hand it to the caller, then clear it and detach it from its parent.
+  Memory holds only the record being built and the path of open parents.
+- Fields are ElementTree paths relative to the record:
+    "name"         → text of <name>
+    "address/city" → text of <city> inside <address>
+    "@id"          → attribute `id` of the record
+    "phone/@type"  → attribute `type` of <phone>
+  Missing fields come back as None.
+- `xml_to_csv()` / `xml_to_ndjson()` stream records straight into a file.
+"""
+
+PERSON_FIELDS = {"name": "name", "age": "age", "city": "city"}
+
+# ------------------------------------------------
+# 2. Field Extractors
+# ------------------------------------------------
+def _extractor(path):
+    path, _, attribute = path.partition("@")
+    path = path.rstrip("/")
+    if attribute:
+        if not path:
+            return lambda element: element.get(attribute)
+
+        def attribute_of_child(element):
+            child = element.find(path)
+            return None if child is None else child.get(attribute)
+        return attribute_of_child
+    return lambda element: element.findtext(path)
+
+
+def _converted(extract, convert):
+    def extract_and_convert(element):
+        value = extract(element)
+        return None if value is None else convert(value)
+    return extract_and_convert
+
+
+def _compile_fields(fields, converters):
+    converters = converters or {}
+    compiled = []
+    for name, path in fields.items():
+        extract = _extractor(path)
+        if name in converters:
+            extract = _converted(extract, converters[name])
+        compiled.append(extract)
+    return compiled
+
+# ------------------------------------------------
+# 3. Streaming Record Iterator
+# ------------------------------------------------
+def iter_records(source, tag="person", fields=None, converters=None, as_tuples=False):
+    """Yield one dict (or tuple) per `tag` element of `source` (path or binary file).
+    `fields` maps output name → path; `converters` maps output name → callable."""
+    fields = fields or PERSON_FIELDS
+    names = list(fields)
+    extractors = _compile_fields(fields, converters)
+    parents = []    # Open elements from the root down to the current one
+    in_record = 0   # > 0 while inside a record (records may nest)
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            if element.tag == tag:
+                in_record += 1
+            continue
+
+        parents.pop()
+        if element.tag == tag:
+            in_record -= 1
+            values = [extract(element) for extract in extractors]
+            yield tuple(values) if as_tuples else dict(zip(names, values))
+        elif in_record:
+            continue  # Part of a record that is still open → keep it for its fields
+        # Done with this element: free its children and drop it from the tree
+        element.clear()
+        if parents:
+            parents[-1].remove(element)
+
+# ------------------------------------------------
+# 4. Direct Conversion to CSV / NDJSON
+# ------------------------------------------------
+def xml_to_csv(source, output_path, tag="person", fields=None, converters=None):
+    fields = fields or PERSON_FIELDS
+    count = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(fields))
+        for row in iter_records(source, tag, fields, converters, as_tuples=True):
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def xml_to_ndjson(source, output_path, tag="person", fields=None, converters=None, batch_size=1000):
+    with NdjsonWriter(output_path, batch_size) as writer:
+        writer.write_many(iter_records(source, tag, fields, converters))
+        writer.flush()
+        return writer.written
+
+# ------------------------------------------------
+# 5. Benchmark vs `ET.parse` + `findall`
+# ------------------------------------------------
+if __name__ == "__main__":
+    demo_file = "big_data.xml"
+    cities = ["New York", "Los Angeles", "Chicago", "Houston"]
+    with open(demo_file, "w", encoding="utf-8") as file:
+        file.write("<data>\n")
+        for i in range(300_000):
+            file.write(f'    <person id="{i}">\n        <name>user_{i}</name>\n        <age>{18 + i % 60}</age>\n'
+                       f"        <city>{cities[i % 4]}</city>\n    </person>\n")
+        file.write("</data>\n")
+
+    def parse_whole():
+        root = ET.parse(demo_file).getroot()
+        return len([(person.find("name").text, person.find("age").text, person.find("city").text)
+                    for person in root.findall("person")])
+
+    measure("ET.parse + findall", parse_whole)
+    measure("iter_records", lambda: sum(1 for _ in iter_records(demo_file, converters={"age": int})))
+
+    fields = {"id": "@id", "name": "name", "city": "city"}
+    print("First record:", next(iter_records(demo_file, fields=fields)))
+    print("NDJSON records:", xml_to_ndjson(demo_file, "big_data.ndjson", converters={"age": int}))
+    print("CSV rows:", xml_to_csv(demo_file, "big_data.csv"))
+
+    for path in (demo_file, "big_data.ndjson", "big_data.csv"):
+        os.remove(path)
@@ -0,0 +1,145 @@
+"""
+UsersReplica recovery paths, driven by a simulated change stream (no server needed)
+"""
+
+import time
+import unittest
+from collections import deque
+
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from com.niteshsynergy.db.day22ReplicaCache import UsersReplica, CHANGE_STREAM_HISTORY_LOST
+
+
+def _event(number, operation, _id, document=None):
+    return {"_id": {"_data": number}, "operationType": operation,
+            "documentKey": {"_id": _id}, "fullDocument": document}
+
+
+class FakeCollection:
+    """`find()` returns the next snapshot each call (the last one repeats)."""
+
+    def __init__(self, *snapshots):
+        self.snapshots = deque(snapshots)
+
+    def find(self):
+        return list(self.snapshots.popleft() if len(self.snapshots) > 1 else self.snapshots[0])
+
+
+class FakeStream:
+    """Replays events; an exception in the script is raised by `try_next()`."""
+
+    def __init__(self, items=(), token=None):
+        self.items = deque(items)
+        self.resume_token = token
+        self.closed = False
+
+    def try_next(self):
+        if not self.items:
+            return None
+        item = self.items.popleft()
+        if isinstance(item, BaseException):
+            raise item
+        self.resume_token = item["_id"]
+        return item
+
+    def close(self):
+        self.closed = True
+
+
+class StreamOpener:
+    """`open_stream` hook: hands out scripted streams (or raises scripted errors)."""
+
+    def __init__(self, *streams):
+        self.streams = deque(streams)
+        self.calls = []
+
+    def __call__(self, resume_after):
+        self.calls.append(resume_after)
+        stream = self.streams.popleft() if self.streams else FakeStream(token=resume_after)
+        if isinstance(stream, BaseException):
+            raise stream
+        return stream
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class UsersReplicaTest(unittest.TestCase):
+    def setUp(self):
+        self.collection = FakeCollection([{"_id": 1, "username": "alice"}, {"_id": 2, "username": "bob"}],
+                                         [{"_id": 9, "username": "zoe"}])  # State after a resync
+        self.replica = None
+
+    def tearDown(self):
+        if self.replica is not None:
+            self.replica.stop()
+
+    def _start(self, opener):
+        self.replica = UsersReplica(self.collection, open_stream=opener, poll_interval=0.01, max_backoff=0.05)
+        return self.replica.start()
+
+    def test_initial_load_and_events(self):
+        stream = FakeStream([
+            _event(1, "insert", 3, {"_id": 3, "username": "carol"}),
+            _event(2, "update", 1, {"_id": 1, "username": "alice", "city": "Houston"}),
+        ])
+        replica = self._start(StreamOpener(stream))
+        self.assertTrue(_wait_for(lambda: replica.events_applied == 2))
+        self.assertEqual(replica.get("carol")["_id"], 3)
+        self.assertEqual(replica.get("alice")["city"], "Houston")
+        self.assertEqual(replica.resume_token, {"_data": 2})
+
+    def test_delete_removes_both_indexes(self):
+        replica = self._start(StreamOpener(FakeStream([_event(1, "delete", 2)])))
+        self.assertTrue(_wait_for(lambda: replica.events_applied == 1))
+        self.assertIsNone(replica.get("bob"))
+        self.assertIsNone(replica.get_by_id(2))
+        self.assertEqual(len(replica), 1)
+
+    def test_network_error_resumes_from_last_token(self):
+        first = FakeStream([_event(1, "insert", 3, {"_id": 3, "username": "carol"}), AutoReconnect("lost")])
+        second = FakeStream([_event(2, "insert", 4, {"_id": 4, "username": "dave"})])
+        opener = StreamOpener(first, second)
+        replica = self._start(opener)
+        self.assertTrue(_wait_for(lambda: replica.get("dave") is not None))
+        self.assertEqual(opener.calls, [None, {"_data": 1}])  # Reopened with resume_after
+        self.assertTrue(first.closed)
+        self.assertEqual(replica.resyncs, 1)
+        self.assertTrue(replica.healthy)
+
+    def test_drop_event_triggers_resync(self):
+        opener = StreamOpener(FakeStream([_event(1, "drop", None)]))
+        replica = self._start(opener)
+        self.assertTrue(_wait_for(lambda: replica.resyncs == 2))
+        self.assertEqual(opener.calls, [None, None])  # Resync reopens without a token
+        self.assertEqual(replica.get("zoe")["_id"], 9)
+        self.assertIsNone(replica.get("alice"))
+
+    def test_lost_history_on_reopen_falls_back_to_resync(self):
+        first = FakeStream([_event(1, "insert", 3, {"_id": 3, "username": "carol"}), AutoReconnect("lost")])
+        history_lost = OperationFailure("resume token too old", code=CHANGE_STREAM_HISTORY_LOST)
+        opener = StreamOpener(first, history_lost)
+        replica = self._start(opener)
+        self.assertTrue(_wait_for(lambda: replica.resyncs == 2))
+        self.assertEqual(opener.calls, [None, {"_data": 1}, None])
+        self.assertTrue(replica.healthy)
+
+    def test_failed_recovery_backs_off_and_retries(self):
+        first = FakeStream([AutoReconnect("lost")])
+        opener = StreamOpener(first, AutoReconnect("down"), AutoReconnect("down"))
+        replica = self._start(opener)
+        self.assertTrue(_wait_for(lambda: replica.healthy and replica.recovery_failures == 2))
+        stats = replica.stats()
+        self.assertTrue(stats["thread_alive"])
+        self.assertIn("down", stats["last_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()